@@ -0,0 +1,29 @@
+"""Optional numba support.
+
+Kernels decorated with `njit` are compiled when numba is installed (`pip install .[fast]`).
+Without numba, HAVE_NUMBA is False and callers take their pandas/numpy path instead;
+the decorator below is then a no-op so kernel definitions still import, and prange is
+plain range.
+
+Kernels use cache=True, so compiled code is written next to the module's __pycache__ and
+reused by later processes (WFA/basin workers). Point NUMBA_CACHE_DIR at a shared writable
+directory if the install location is read-only.
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit, prange
+
+    HAVE_NUMBA = True
+except ImportError:
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def deco(fn):
+            return fn
+
+        return deco
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
@@ -42,6 +43,18 @@ def _load_parquet(path: Path) -> pd.DataFrame:
     return df.sort_index()
 
 
+def load_parquet_legs(paths: list[Path]) -> list[pd.DataFrame]:
+    """Load several bar files (one per leg) like _load_parquet, returned in input order.
+
+    Parquet decoding in pyarrow releases the GIL, so the files are read on a thread pool
+    instead of one after another.
+    """
+    if len(paths) <= 1:
+        return [_load_parquet(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=len(paths)) as ex:
+        return list(ex.map(_load_parquet, paths))
+
+
 def _to_bt_df(df_utc: pd.DataFrame) -> pd.DataFrame:
     if df_utc.index.tz is None:
         raise ValueError("df index must be tz-aware (UTC)")
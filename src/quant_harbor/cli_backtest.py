@@ -6,10 +6,8 @@ from zoneinfo import ZoneInfo
 import argparse
 import json
 
-import pandas as pd
-
 from quant_harbor.alpaca_data import make_snapshot_multi
-from quant_harbor.backtest_runner import BacktestConfig, run_backtest_df
+from quant_harbor.backtest_runner import BacktestConfig, load_parquet_legs, run_backtest_df
 from quant_harbor.strategies.registry import get_strategy_spec
 
 ET = ZoneInfo("America/New_York")
@@ -47,13 +45,11 @@ def main():
     snap_dir = make_snapshot_multi(syms, start_et=start_et, end_et=end_et, base_dir=project_root / "data" / "snapshots")
 
     # load dfs
-    dfs = []
-    for s in syms:
-        p = snap_dir / f"bars_{s}.parquet" if (snap_dir / f"bars_{s}.parquet").exists() else (snap_dir / "bars.parquet")
-        df = pd.read_parquet(p)
-        if df.index.tz is None:
-            df.index = pd.to_datetime(df.index, utc=True)
-        dfs.append(df.sort_index())
+    paths = [
+        snap_dir / f"bars_{s}.parquet" if (snap_dir / f"bars_{s}.parquet").exists() else (snap_dir / "bars.parquet")
+        for s in syms
+    ]
+    dfs = load_parquet_legs(paths)
 
     # params
     params = {}
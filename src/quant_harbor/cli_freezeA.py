@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import partial
 from itertools import product
 from pathlib import Path
 from zoneinfo import ZoneInfo
@@ -11,11 +12,11 @@ import numpy as np
 import pandas as pd
 
 from quant_harbor.alpaca_data import make_snapshot_multi
-from quant_harbor.backtest_runner import BacktestConfig, run_backtest_df
+from quant_harbor.backtest_runner import BacktestConfig, load_parquet_legs, run_backtest_df
 from quant_harbor.scorecard import scorecard_v1
 from quant_harbor.split import split_train_val_test_last12m
 from quant_harbor.strategies.registry import get_strategy_spec
-from quant_harbor.walk_forward import make_quarterly_wfa_windows
+from quant_harbor.walk_forward import WfaWindow, make_quarterly_wfa_windows, run_wfa, slice_utc
 
 ET = ZoneInfo("America/New_York")
 UTC = ZoneInfo("UTC")
@@ -30,6 +31,35 @@ def _grid_from_space(space: dict) -> list[dict]:
     return out
 
 
+def _eval_window_oos(
+    candidates: list[dict],
+    out_root: Path,
+    cfg: BacktestConfig,
+    strategy_id: str,
+    syms: list[str],
+    i: int,
+    w: WfaWindow,
+    train_dfs,
+    oos_dfs: list[pd.DataFrame],
+) -> list[dict]:
+    """OOS summaries of every candidate on window i (a run_wfa runner)."""
+    spec = get_strategy_spec(strategy_id)
+    meta = {
+        "segment": "wfa_oos_fixed_params",
+        "window": i,
+        "oos_start_utc": str(w.oos_start),
+        "oos_end_utc": str(w.oos_end),
+        "strategy_id": spec.id,
+        "symbols": syms,
+    }
+    summaries = []
+    for k, params in enumerate(candidates):
+        win_dir = out_root / "candidates" / f"cand_{k:04d}" / "windows" / f"window_{i:02d}"
+        s = run_backtest_df(oos_dfs, out_dir=win_dir, cfg=cfg, strategy_cls=spec.cls, strat_params=params, snapshot_meta=meta, persist_details=False, strategy_id=spec.id)
+        summaries.append(s)
+    return summaries
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--strategy", required=True)
@@ -41,6 +71,7 @@ def main():
 
     ap.add_argument("--min-pos-window-rate", type=float, default=0.70)
     ap.add_argument("--grid-json", default="", help="Optional JSON dict of param space to override registry default")
+    ap.add_argument("--workers", type=int, default=None, help="Processes for the WFA windows (default: CPU count; 1 = serial)")
 
     args = ap.parse_args()
 
@@ -56,19 +87,13 @@ def main():
     snap_dir = make_snapshot_multi(syms, start_et=start_et, end_et=end_et, base_dir=project_root / "data" / "snapshots")
 
     # Load bars per leg
-    dfs = []
-    for s in syms:
-        p = snap_dir / f"bars_{s}.parquet"
-        df = pd.read_parquet(p)
-        if df.index.tz is None:
-            df.index = pd.to_datetime(df.index, utc=True)
-        dfs.append(df.sort_index())
+    dfs = load_parquet_legs([snap_dir / f"bars_{s}.parquet" for s in syms])
 
     # Use leg0 for time splitting; slice all legs by the same UTC bounds
     split0 = split_train_val_test_last12m(dfs[0])
 
     def _slice_all(dfx_list: list[pd.DataFrame], start, end):
-        return [df[(df.index >= start) & (df.index <= end)] for df in dfx_list]
+        return [slice_utc(df, start, end) for df in dfx_list]
 
     pre0 = pd.concat([split0.train, split0.val]).sort_index()
     windows = make_quarterly_wfa_windows(pre0.index, train_months=args.train_months, oos_months=args.oos_months)
@@ -88,23 +113,6 @@ def main():
 
     cfg = BacktestConfig(symbol="-".join(syms))
 
-    def _eval_candidate_oos(params: dict, cand_dir: Path):
-        summaries = []
-        for i, w in enumerate(windows):
-            oos_dfs = _slice_all(dfs, w.oos_start, w.oos_end)
-            win_dir = cand_dir / "windows" / f"window_{i:02d}"
-            meta = {
-                "segment": "wfa_oos_fixed_params",
-                "window": i,
-                "oos_start_utc": str(w.oos_start),
-                "oos_end_utc": str(w.oos_end),
-                "strategy_id": spec.id,
-                "symbols": syms,
-            }
-            s = run_backtest_df(oos_dfs, out_dir=win_dir, cfg=cfg, strategy_cls=spec.cls, strat_params=params, snapshot_meta=meta, persist_details=False, strategy_id=spec.id)
-            summaries.append(s)
-        return summaries
-
     def _aggregate_oos(summaries: list[dict]):
         rets = np.array([float(s.get("net_return_pct") or 0.0) for s in summaries], dtype=float)
         pnls = np.array([float(s.get("net_pnl") or 0.0) for s in summaries], dtype=float)
@@ -117,10 +125,18 @@ def main():
             "oos_net_return_worst": float(np.min(rets)) if len(rets) else None,
         }
 
+    # Windows are independent: each worker runs every candidate on its window's OOS slice.
+    per_window = run_wfa(
+        windows,
+        partial(_eval_window_oos, candidates, out_root, cfg, spec.id, syms),
+        dfs,
+        max_workers=args.workers,
+        with_train=False,
+    )
+
     rows = []
     for k, p in enumerate(candidates):
-        cand_dir = out_root / "candidates" / f"cand_{k:04d}"
-        summ = _eval_candidate_oos(p, cand_dir)
+        summ = [win[k] for win in per_window]
         agg = _aggregate_oos(summ)
         rows.append({"cand": k, **p, **agg})
 
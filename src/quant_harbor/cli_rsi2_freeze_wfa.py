@@ -39,7 +39,7 @@ def _oos_metrics_for_candidate(pre: pd.DataFrame, windows: list, cfg: BacktestCo
     """
     out = []
     for i, w in enumerate(windows):
-        oos_df = pre[(pre.index >= w.oos_start) & (pre.index <= w.oos_end)]
+        oos_df = pre.iloc[w.oos_lo:w.oos_hi]
         win_dir = out_dir / "windows" / f"window_{i:02d}"
         meta = {
             "segment": "wfa_oos_fixed_params",
@@ -106,8 +106,8 @@ def main():
     for i, w in enumerate(windows):
         win_dir = out_root / f"window_{i:02d}"
 
-        train_df = pre[(pre.index >= w.train_start) & (pre.index <= w.train_end)]
-        oos_df = pre[(pre.index >= w.oos_start) & (pre.index <= w.oos_end)]
+        train_df = pre.iloc[w.train_lo:w.train_hi]
+        oos_df = pre.iloc[w.oos_lo:w.oos_hi]
 
         # pick best params on TRAIN
         best = None
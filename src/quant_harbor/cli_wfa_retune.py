@@ -1,7 +1,6 @@
 from __future__ import annotations
 
 from datetime import datetime
-from itertools import product
 from pathlib import Path
 from zoneinfo import ZoneInfo
 import argparse
@@ -11,26 +10,17 @@ import numpy as np
 import pandas as pd
 
 from quant_harbor.alpaca_data import make_snapshot_multi
-from quant_harbor.backtest_runner import BacktestConfig, run_backtest_df
+from quant_harbor.backtest_runner import BacktestConfig, load_parquet_legs, run_backtest_df
 from quant_harbor.split import split_train_val_test_last12m
-from quant_harbor.strategies.registry import get_strategy_spec
-from quant_harbor.walk_forward import make_quarterly_wfa_windows
+from quant_harbor.strategies.registry import expand_grid, get_strategy_spec, run_grid
+from quant_harbor.walk_forward import make_quarterly_wfa_windows, slice_utc
 
 ET = ZoneInfo("America/New_York")
 UTC = ZoneInfo("UTC")
 
 
-def _grid_from_space(space: dict) -> list[dict]:
-    keys = list(space.keys())
-    vals = [space[k] for k in keys]
-    out = []
-    for combo in product(*vals):
-        out.append(dict(zip(keys, combo)))
-    return out
-
-
 def _slice_all(dfs: list[pd.DataFrame], start, end) -> list[pd.DataFrame]:
-    return [df[(df.index >= start) & (df.index <= end)] for df in dfs]
+    return [slice_utc(df, start, end) for df in dfs]
 
 
 def _score_train(summary: dict) -> float:
@@ -50,6 +40,7 @@ def main():
     ap.add_argument("--oos-months", type=int, default=3)
 
     ap.add_argument("--grid-json", default="", help="Optional JSON dict of param space to override registry default")
+    ap.add_argument("--workers", type=int, default=None, help="Processes for the train grid (default: CPU count; 1 = serial)")
 
     # soft filters during train selection
     ap.add_argument("--max-dd-intra", type=float, default=10.0)
@@ -68,12 +59,7 @@ def main():
     project_root = Path(__file__).resolve().parents[2]
     snap_dir = make_snapshot_multi(syms, start_et=start_et, end_et=end_et, base_dir=project_root / "data" / "snapshots")
 
-    dfs = []
-    for s in syms:
-        df = pd.read_parquet(snap_dir / f"bars_{s}.parquet")
-        if df.index.tz is None:
-            df.index = pd.to_datetime(df.index, utc=True)
-        dfs.append(df.sort_index())
+    dfs = load_parquet_legs([snap_dir / f"bars_{s}.parquet" for s in syms])
 
     split0 = split_train_val_test_last12m(dfs[0])
     pre0 = pd.concat([split0.train, split0.val]).sort_index()
@@ -85,7 +71,7 @@ def main():
     space = spec.default_param_grid()
     if args.grid_json:
         space = json.loads(args.grid_json)
-    candidates = _grid_from_space(space)
+    candidates = expand_grid(space)
 
     run_id = datetime.now(tz=ET).strftime("%Y%m%d_%H%M%S")
     out_root = project_root / "results" / f"wfa_retune_{spec.id}_{'-'.join(syms)}_{run_id}"
@@ -115,23 +101,23 @@ def main():
         best_train = None
         best_score = -1e18
 
-        # Evaluate candidates on TRAIN (summary-only)
-        for j, p in enumerate(candidates):
-            tmp_dir = out_root / f"window_{i:02d}" / "train" / f"cand_{j:04d}"
-            meta = dict(snap_meta)
-            meta.update(
-                {
-                    "segment": "wfa_train_retune",
-                    "window": i,
-                    "cand": j,
-                    "train_start_utc": str(w.train_start),
-                    "train_end_utc": str(w.train_end),
-                    "oos_start_utc": str(w.oos_start),
-                    "oos_end_utc": str(w.oos_end),
-                }
-            )
-            s = run_backtest_df(train_dfs, out_dir=tmp_dir, cfg=cfg, strategy_cls=spec.cls, strat_params=p, snapshot_meta=meta, persist_details=False, strategy_id=spec.id)
-
+        # Evaluate candidates on TRAIN (summary-only), in parallel; results come back in candidate order
+        meta = dict(snap_meta)
+        meta.update(
+            {
+                "segment": "wfa_train_retune",
+                "window": i,
+                "train_start_utc": str(w.train_start),
+                "train_end_utc": str(w.train_end),
+                "oos_start_utc": str(w.oos_start),
+                "oos_end_utc": str(w.oos_end),
+            }
+        )
+        train_results = run_grid(
+            spec.id, train_dfs, cfg, out_root / f"window_{i:02d}" / "train",
+            grid=candidates, snapshot_meta=meta, max_workers=args.workers,
+        )
+        for p, s in train_results:
             dd = float(s.get("max_drawdown_intrabar_pct") or 1e9)
             trades = int(s.get("total_trades") or 0)
             if dd > float(args.max_dd_intra):
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from pathlib import Path
 import json
 
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -19,7 +21,8 @@ from quant_harbor.dashboard.utils import (
     load_equity,
     load_trades,
     load_parquet,
-    load_snapshot_bars,
+    load_snapshot_bars_et,
+    to_utc_datetime,
 )
 
 
@@ -29,6 +32,44 @@ ROOT = Path(__file__).resolve().parents[3]  # quant_harbor/
 RESULTS_DIR = ROOT / "results"
 
 
+@lru_cache(maxsize=256)
+def _resolve(p: str) -> Path:
+    # resolve() hits the filesystem (stat/readlink); memoize across reruns.
+    return Path(p).expanduser().resolve()
+
+
+def _mtime(p: Path) -> float | None:
+    """File mtime (None if missing); passed into cached loaders so a rewritten file misses."""
+    try:
+        return p.stat().st_mtime
+    except OSError:
+        return None
+
+
+@st.cache_data(show_spinner=False)
+def _cached_snapshot_bars(snap_path: str, symbol: str, mtime: tuple | None = None):
+    # Cached per (snapshot, symbol, bars file mtimes): UTC bars + pre-converted ET view.
+    return load_snapshot_bars_et(Path(snap_path), symbol)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_trades(run_dir: str, mtime: float | None = None):
+    # Parse entry/exit timestamps once per trades file (version) instead of on every rerun.
+    tr = load_trades(Path(run_dir))
+    if tr is not None and not tr.empty:
+        tr["entry_dt"] = to_utc_datetime(tr["entry_dt"])
+        tr["exit_dt"] = to_utc_datetime(tr["exit_dt"])
+    return tr
+
+
+def _partition_quantile(x: pd.Series, q: float) -> float:
+    """Approximate quantile (lower nearest rank) via O(n) selection instead of a full sort."""
+    a = x.to_numpy(dtype=float)
+    a = a[~np.isnan(a)]
+    k = int(q * (len(a) - 1))
+    return float(np.partition(a, k)[k])
+
+
 def _fmt(x, digits=2):
     if x is None:
         return None
@@ -48,12 +89,12 @@ def page_leaderboard_v2():
 
         with st.sidebar:
             st.header("Filters")
-            symbol = st.selectbox("Symbol", ["(all)"] + sorted([x for x in df["symbol"].dropna().unique()]))
-            strategy = st.selectbox("Strategy", ["(all)"] + sorted([x for x in df["strategy"].dropna().unique()]))
-            run_kind = st.selectbox("Run kind", ["(all)"] + sorted([x for x in df["run_kind"].dropna().unique()]))
+            symbol = st.selectbox("Symbol", ["(all)"] + list(df["symbol"].cat.categories))
+            strategy = st.selectbox("Strategy", ["(all)"] + list(df["strategy"].cat.categories))
+            run_kind = st.selectbox("Run kind", ["(all)"] + list(df["run_kind"].cat.categories))
             min_score = st.slider("Total score >=", 0.0, 100.0, 0.0, 1.0)
 
-        dff = df.copy()
+        dff = df
         if symbol != "(all)":
             dff = dff[dff["symbol"] == symbol]
         if strategy != "(all)":
@@ -65,7 +106,7 @@ def page_leaderboard_v2():
 
         st.subheader("Scorecards")
         st.dataframe(
-            dff.sort_values(by=["total_score"], ascending=False),
+            dff.sort_values(by=["total_score"], ascending=False, ignore_index=True),
             use_container_width=True,
             hide_index=True,
         )
@@ -82,12 +123,12 @@ def page_leaderboard_v2():
 
     with st.sidebar:
         st.header("Filters")
-        symbol = st.selectbox("Symbol", ["(all)"] + sorted([x for x in df['symbol'].dropna().unique()]))
-        strategy = st.selectbox("Strategy", ["(all)"] + sorted([x for x in df['strategy'].dropna().unique()]))
+        symbol = st.selectbox("Symbol", ["(all)"] + list(df['symbol'].cat.categories))
+        strategy = st.selectbox("Strategy", ["(all)"] + list(df['strategy'].cat.categories))
         maxdd = st.slider("MaxDD intrabar <= (%)", 0.0, 50.0, 10.0, 0.5)
         min_trades = st.number_input("Trades >=", min_value=0, value=200, step=10)
 
-    dff = df.copy()
+    dff = df
     if symbol != "(all)":
         dff = dff[dff["symbol"] == symbol]
     if strategy != "(all)":
@@ -98,7 +139,7 @@ def page_leaderboard_v2():
 
     st.subheader("Runs")
     st.dataframe(
-        dff.sort_values(by=["net_pnl"], ascending=False),
+        dff.sort_values(by=["net_pnl"], ascending=False, ignore_index=True),
         use_container_width=True,
         hide_index=True,
     )
@@ -145,32 +186,36 @@ def page_details_v2():
     def _load_summary(path_str: str | None):
         if not path_str:
             return None
-        p = (ROOT / path_str).resolve() if str(path_str).startswith("results/") else Path(path_str).expanduser().resolve()
+        p = _resolve(str(ROOT / path_str)) if str(path_str).startswith("results/") else _resolve(str(path_str))
         return json.loads(p.read_text()) if p.exists() else None
 
     val_summary = _load_summary(sources.get("val_summary"))
     test_summary = _load_summary(sources.get("test_summary"))
 
-    cols = st.columns(2)
-    if val_summary:
-        cols[0].subheader("VAL")
-        cols[0].metric("Net%", _fmt(val_summary.get("net_return_pct"), 3))
-        cols[0].metric("MaxDD intra%", _fmt(val_summary.get("max_drawdown_intrabar_pct"), 3))
-        cols[0].metric("PF", _fmt(val_summary.get("profit_factor"), 3))
-        cols[0].metric("Trades", val_summary.get("total_trades"))
-        cols[0].caption(f"UTC: {val_summary.get('data_dt_min_utc')} → {val_summary.get('data_dt_max_utc')}")
-    else:
-        cols[0].info("VAL summary not provided")
-
-    if test_summary:
-        cols[1].subheader("TEST")
-        cols[1].metric("Net%", _fmt(test_summary.get("net_return_pct"), 3))
-        cols[1].metric("MaxDD intra%", _fmt(test_summary.get("max_drawdown_intrabar_pct"), 3))
-        cols[1].metric("PF", _fmt(test_summary.get("profit_factor"), 3))
-        cols[1].metric("Trades", test_summary.get("total_trades"))
-        cols[1].caption(f"UTC: {test_summary.get('data_dt_min_utc')} → {test_summary.get('data_dt_max_utc')}")
-    else:
-        cols[1].info("TEST summary not provided")
+    # One table for both segments (a single widget instead of per-card metrics).
+    segs = {"VAL": val_summary, "TEST": test_summary}
+    seg_rows = [
+        ("Net%", "net_return_pct", 3),
+        ("MaxDD intra%", "max_drawdown_intrabar_pct", 3),
+        ("PF", "profit_factor", 3),
+        ("Trades", "total_trades", 0),
+    ]
+    seg_df = pd.DataFrame(
+        {
+            "metric": [label for label, _, _ in seg_rows],
+            **{
+                name: [_fmt(summ.get(key), digits) if summ else None for _, key, digits in seg_rows]
+                for name, summ in segs.items()
+            },
+        }
+    )
+    st.dataframe(seg_df, use_container_width=True, hide_index=True)
+    st.caption(
+        " | ".join(
+            f"{name} UTC: {summ.get('data_dt_min_utc')} → {summ.get('data_dt_max_utc')}" if summ else f"{name} summary not provided"
+            for name, summ in segs.items()
+        )
+    )
 
     # ---- TEST candlesticks + trade markers ----
     st.write("---")
@@ -190,29 +235,26 @@ def page_details_v2():
 
         sym_sel = st.selectbox("Symbol (leg)", syms)
 
-        snap_path = Path(snapshot_dir).expanduser().resolve()
-        bars = load_snapshot_bars(snap_path, sym_sel)
+        snap_path = _resolve(str(snapshot_dir))
+        bars_mtime = (_mtime(snap_path / f"bars_{sym_sel}.parquet"), _mtime(snap_path / "bars.parquet"))
+        snap = _cached_snapshot_bars(str(snap_path), sym_sel, bars_mtime)
 
-        if bars is None or bars.empty:
+        if snap is None or snap.bars_utc.empty:
             st.warning(f"No bars found in snapshot for {sym_sel}: {snap_path}")
         else:
-            # Filter to test range
+            # Filter to test range (same row mask for the UTC and ET views)
             t0 = pd.to_datetime(test_summary.get("data_dt_min_utc"), utc=True)
             t1 = pd.to_datetime(test_summary.get("data_dt_max_utc"), utc=True)
-            bars = bars[(bars.index >= t0) & (bars.index <= t1)].copy()
+            in_test = (snap.bars_utc.index >= t0) & (snap.bars_utc.index <= t1)
+            bars = snap.bars_utc[in_test].copy()
+            bars_et = snap.bars_et[in_test]
 
             # Load trades from the test directory (if present)
-            test_dir = (ROOT / Path(test_summary_path).parent).resolve() if str(test_summary_path).startswith("results/") else Path(test_summary_path).expanduser().resolve().parent
-            tr = load_trades(test_dir)
-            if tr is not None and not tr.empty:
-                tr = tr.copy()
-                tr["entry_dt"] = pd.to_datetime(tr["entry_dt"], utc=True, errors="coerce")
-                tr["exit_dt"] = pd.to_datetime(tr["exit_dt"], utc=True, errors="coerce")
-
-            # Convert to ET for nicer rangebreaks (skip overnight/weekend gaps)
-            bars_et = bars.copy()
-            bars_et.index = bars_et.index.tz_convert("America/New_York").tz_localize(None)
+            test_dir = _resolve(str(ROOT / Path(test_summary_path).parent)) if str(test_summary_path).startswith("results/") else _resolve(str(test_summary_path)).parent
+            trades_mtime = _mtime(Path(test_dir) / "trades.parquet")
+            tr = _cached_trades(str(test_dir), trades_mtime)
 
+            # bars_et is ET-naive for nicer rangebreaks (skip overnight/weekend gaps)
             fig = go.Figure(
                 data=[
                     go.Candlestick(
@@ -279,8 +321,8 @@ def page_details_v2():
 
             # Robust y-axis scaling: use quantiles to avoid single outlier making candles look too tall.
             try:
-                lo = float(bars_et["low"].quantile(0.01))
-                hi = float(bars_et["high"].quantile(0.99))
+                lo = _partition_quantile(bars_et["low"], 0.01)
+                hi = _partition_quantile(bars_et["high"], 0.99)
                 pad = (hi - lo) * 0.05 if hi > lo else (hi * 0.01 if hi else 1.0)
                 fig.update_yaxes(range=[lo - pad, hi + pad])
             except Exception:
@@ -289,62 +331,13 @@ def page_details_v2():
             use_tv = st.toggle("TradingView-like chart", value=True, help="Use lightweight-charts (TradingView-style zoom/pan).")
 
             if use_tv:
-                # Build lightweight-charts candles (unix seconds)
-                c = []
-                for ts, row in bars.iterrows():
-                    c.append({
-                        "time": int(ts.timestamp()),
-                        "open": float(row["open"]),
-                        "high": float(row["high"]),
-                        "low": float(row["low"]),
-                        "close": float(row["close"]),
-                    })
-
-                m = []
-                if tr is not None and not tr.empty:
-                    # snap markers to nearest candle time to avoid drift
-                    x_index = pd.DatetimeIndex(bars.index)
-
-                    # Parse trade timestamps robustly
-                    entry_dt = pd.to_datetime(tr["entry_dt"], utc=True, errors="coerce")
-                    exit_dt = pd.to_datetime(tr["exit_dt"], utc=True, errors="coerce")
-
-                    def _snap(ts_series: pd.Series) -> list[int | None]:
-                        idx = x_index.get_indexer(ts_series, method="nearest", tolerance=pd.Timedelta(minutes=60))
-                        out: list[int | None] = []
-                        for i in idx:
-                            out.append(int(x_index[i].timestamp()) if i != -1 else None)
-                        return out
-
-                    entry_ts = _snap(entry_dt)
-                    exit_ts = _snap(exit_dt)
-
-                    for t in entry_ts:
-                        if t is None:
-                            continue
-                        m.append({"time": t, "position": "belowBar", "color": "#26a69a", "shape": "arrowUp", "text": "BUY"})
-                    for t in exit_ts:
-                        if t is None:
-                            continue
-                        m.append({"time": t, "position": "aboveBar", "color": "#ef5350", "shape": "arrowDown", "text": "SELL"})
-
-                    # Lightweight-charts expects markers sorted by time.
-                    m = sorted(m, key=lambda x: (x.get("time", 0), x.get("text", "")))
-
-                # SMA5 (requested by user)
-                sma_data = []
-                bars["sma5"] = bars["close"].rolling(5).mean()
-                for ts, row in bars.iterrows():
-                    if pd.notna(row["sma5"]):
-                        sma_data.append({"time": int(ts.timestamp()), "value": float(row["sma5"])})
-
-                # Regime on TEST bars (15m): compute and persist.
+                # Regime on TEST bars (15m): compute and persist on every render, like the
+                # rest of the run artifacts (repeat calls hit compute_regime's own cache).
                 # Render as a separate synced pane (TradingView-style):
                 # - Top: candles + trade markers + SMA
                 # - Bottom: regime histogram + direction_score line
                 reg = None
-                regime_hist = []
-                dir_line = []
+                reg_err = None
                 try:
                     reg = compute_regime(bars, RegimeConfig())
 
@@ -353,59 +346,131 @@ def page_details_v2():
                         outp = Path(test_dir).parent / "regime_test.parquet"
                         reg_out = reg.copy()
                         reg_out.reset_index().rename(columns={"timestamp": "dt_utc"}).to_parquet(outp, index=False)
-
-                    if reg is not None and not reg.empty and "regime" in reg.columns:
-                        def _rcolor(r: str) -> str:
-                            if r == "Uptrend":
-                                return "#26a69a"
-                            if r == "Downtrend":
-                                return "#ef5350"
-                            if r == "Range":
-                                return "#42a5f5"
-                            return "#9e9e9e"
-
-                        def _rval(r: str) -> float:
-                            # values only used for vertical scaling; sign helps differentiate up/down.
-                            if r == "Uptrend":
-                                return 1.0
-                            if r == "Downtrend":
-                                return -1.0
-                            if r == "Range":
-                                return 0.6
-                            return 0.0
-
-                        for ts, rlab in reg["regime"].items():
-                            if pd.isna(rlab):
-                                continue
-                            rlab = str(rlab)
-                            if rlab == "Neutral":
-                                continue  # keep it clean
-                            regime_hist.append({
-                                "time": int(pd.Timestamp(ts).timestamp()),
-                                "value": float(_rval(rlab)),
-                                "color": _rcolor(rlab),
-                            })
-
-                        # Direction line (optional but helpful): [-1, 1]
-                        if "direction_score" in reg.columns:
-                            for ts, v in reg["direction_score"].items():
-                                if pd.isna(v):
-                                    continue
-                                dir_line.append({"time": int(pd.Timestamp(ts).timestamp()), "value": float(v)})
-
-                        st.caption("Regime pane: Uptrend(green) / Downtrend(red) / Range(blue). Neutral omitted.")
                 except Exception as e:
-                    st.warning(f"Regime compute failed: {e}")
-
-                html = render_lightweight_chart_dual(
-                    candles=c,
-                    markers=m,
-                    regime_hist=regime_hist,
-                    direction_line=dir_line,
-                    sma_line=sma_data,
-                    height_top=420,
-                    height_bottom=170,
-                )
+                    reg_err = e
+
+                # Reuse the rendered HTML across reruns of the same chart: Streamlit keeps the
+                # existing iframe when the payload is byte-identical, so zoom state survives and
+                # the candles JSON is neither rebuilt nor re-parsed. Only the current chart is
+                # kept; the key includes the artifact mtimes and test range, so a rewritten run
+                # or snapshot is re-rendered.
+                tv_key = (run_id, sym_sel, str(t0), str(t1), bars_mtime, trades_mtime)
+                tv_cached = st.session_state.get("tv_chart")
+                if tv_cached is None or tv_cached[0] != tv_key:
+                    # Build lightweight-charts candles (unix seconds)
+                    c = []
+                    for ts, row in bars.iterrows():
+                        c.append({
+                            "time": int(ts.timestamp()),
+                            "open": float(row["open"]),
+                            "high": float(row["high"]),
+                            "low": float(row["low"]),
+                            "close": float(row["close"]),
+                        })
+
+                    m = []
+                    if tr is not None and not tr.empty:
+                        # snap markers to nearest candle time to avoid drift
+                        x_index = pd.DatetimeIndex(bars.index)
+
+                        def _snap(ts_series: pd.Series) -> list[int | None]:
+                            idx = x_index.get_indexer(ts_series, method="nearest", tolerance=pd.Timedelta(minutes=60))
+                            out: list[int | None] = []
+                            for i in idx:
+                                out.append(int(x_index[i].timestamp()) if i != -1 else None)
+                            return out
+
+                        # entry_dt/exit_dt are already parsed to UTC by _cached_trades
+                        entry_ts = _snap(tr["entry_dt"])
+                        exit_ts = _snap(tr["exit_dt"])
+
+                        m = [
+                            {"time": t, "position": "belowBar", "color": "#26a69a", "shape": "arrowUp", "text": "BUY"}
+                            for t in entry_ts
+                            if t is not None
+                        ] + [
+                            {"time": t, "position": "aboveBar", "color": "#ef5350", "shape": "arrowDown", "text": "SELL"}
+                            for t in exit_ts
+                            if t is not None
+                        ]
+
+                        # Lightweight-charts expects markers sorted by time.
+                        m.sort(key=lambda x: (x["time"], x["text"]))
+
+                    # SMA5 (requested by user)
+                    sma_data = []
+                    bars["sma5"] = bars["close"].rolling(5).mean()
+                    for ts, row in bars.iterrows():
+                        if pd.notna(row["sma5"]):
+                            sma_data.append({"time": int(ts.timestamp()), "value": float(row["sma5"])})
+
+                    regime_msg = None
+                    regime_hist = []
+                    dir_line = []
+                    try:
+                        if reg_err is not None:
+                            raise reg_err
+                        if reg is not None and not reg.empty and "regime" in reg.columns:
+                            def _rcolor(r: str) -> str:
+                                if r == "Uptrend":
+                                    return "#26a69a"
+                                if r == "Downtrend":
+                                    return "#ef5350"
+                                if r == "Range":
+                                    return "#42a5f5"
+                                return "#9e9e9e"
+
+                            def _rval(r: str) -> float:
+                                # values only used for vertical scaling; sign helps differentiate up/down.
+                                if r == "Uptrend":
+                                    return 1.0
+                                if r == "Downtrend":
+                                    return -1.0
+                                if r == "Range":
+                                    return 0.6
+                                return 0.0
+
+                            for ts, rlab in reg["regime"].items():
+                                if pd.isna(rlab):
+                                    continue
+                                rlab = str(rlab)
+                                if rlab == "Neutral":
+                                    continue  # keep it clean
+                                regime_hist.append({
+                                    "time": int(pd.Timestamp(ts).timestamp()),
+                                    "value": float(_rval(rlab)),
+                                    "color": _rcolor(rlab),
+                                })
+
+                            # Direction line (optional but helpful): [-1, 1]
+                            if "direction_score" in reg.columns:
+                                for ts, v in reg["direction_score"].items():
+                                    if pd.isna(v):
+                                        continue
+                                    dir_line.append({"time": int(pd.Timestamp(ts).timestamp()), "value": float(v)})
+
+                            regime_msg = ("caption", "Regime pane: Uptrend(green) / Downtrend(red) / Range(blue). Neutral omitted.")
+                    except Exception as e:
+                        regime_msg = ("warning", f"Regime compute failed: {e}")
+
+                    html = render_lightweight_chart_dual(
+                        candles=c,
+                        markers=m,
+                        regime_hist=regime_hist,
+                        direction_line=dir_line,
+                        sma_line=sma_data,
+                        height_top=420,
+                        height_bottom=170,
+                    )
+                    tv_cached = st.session_state["tv_chart"] = (tv_key, html, regime_msg)
+
+                _, html, regime_msg = tv_cached
+                if regime_msg is not None:
+                    kind, msg = regime_msg
+                    if kind == "warning":
+                        st.warning(msg)
+                    else:
+                        st.caption(msg)
                 components.html(html, height=620, scrolling=False)
             else:
                 fig.update_layout(height=520, margin=dict(l=10, r=10, t=30, b=10), xaxis_rangeslider_visible=False)
@@ -456,9 +521,9 @@ def page_details_v2():
             # if windows parquet exists alongside report
             win_parq = Path(basin_wfa_path).expanduser()
             if str(basin_wfa_path).startswith("results/"):
-                win_parq = (ROOT / basin_wfa_path).resolve()
+                win_parq = _resolve(str(ROOT / basin_wfa_path))
             win_parq = win_parq.parent / "basin_wfa_windows.parquet"
-            bw = load_parquet(win_parq)
+            bw = load_parquet(win_parq, columns=["window", "basin_pass_rate"])
             if bw is not None and "basin_pass_rate" in bw.columns:
                 fig2 = px.line(bw, x="window", y="basin_pass_rate", markers=True, title="Basin pass rate per OOS window")
                 st.plotly_chart(fig2, use_container_width=True)
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
 import json
+import re
 from typing import Any
 
+try:
+    import orjson  # optional: much faster on large candle lists
+except ImportError:
+    orjson = None
+
+
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj, ensure_ascii=False)
+
 
 def render_lightweight_chart(
     *,
@@ -16,9 +28,9 @@ def render_lightweight_chart(
     markers = markers or []
     sma_line = sma_line or []
 
-    data_json = json.dumps(candles, ensure_ascii=False)
-    markers_json = json.dumps(markers, ensure_ascii=False)
-    sma_json = json.dumps(sma_line, ensure_ascii=False)
+    data_json = _dumps(candles)
+    markers_json = _dumps(markers)
+    sma_json = _dumps(sma_line)
 
     return f"""<!doctype html>
 <html>
@@ -87,39 +99,27 @@ def render_lightweight_chart(
 </html>"""
 
 
-def render_lightweight_chart_dual(
-    *,
-    candles: list[dict[str, Any]],
-    markers: list[dict[str, Any]] | None = None,
-    regime_hist: list[dict[str, Any]] | None = None,
-    direction_line: list[dict[str, Any]] | None = None,
-    sma_line: list[dict[str, Any]] | None = None,
-    height_top: int = 420,
-    height_bottom: int = 160,
-) -> str:
-    """Two-pane chart with synced time axis.
-
-    Pane 1: Candles (+ trade markers) + optional SMA
-    Pane 2: Regime histogram (colored) + optional direction line
-
-    Both panes stay in sync when zooming/panning either one.
-    """
-
-    markers = markers or []
-    regime_hist = regime_hist or []
-    direction_line = direction_line or []
-    sma_line = sma_line or []
+_SCRIPT_RE = re.compile(r"(<script\b[^>]*>.*?</script>)", re.DOTALL)
 
-    data_json = json.dumps(candles, ensure_ascii=False)
-    markers_json = json.dumps(markers, ensure_ascii=False)
-    hist_json = json.dumps(regime_hist, ensure_ascii=False)
-    dir_json = json.dumps(direction_line, ensure_ascii=False)
-    sma_json = json.dumps(sma_line, ensure_ascii=False)
 
-    total_h = int(height_top) + int(height_bottom)
+def _minify_html(html: str) -> str:
+    """Strip template indentation/blank lines; the browser ignores it but Streamlit resends it.
 
-    # Avoid f-string brace escaping hell: use a plain template with token replacement.
-    tpl = """<!doctype html>
+    Markup and CSS collapse to single spaces. Inside <script> only leading indentation and
+    blank lines go, so line breaks (and // comments) keep their meaning.
+    """
+    out = []
+    for i, part in enumerate(_SCRIPT_RE.split(html)):
+        if i % 2:
+            out.append("\n".join(ln.strip() for ln in part.splitlines() if ln.strip()))
+        else:
+            out.append(re.sub(r"\s+", " ", re.sub(r">\s+<", "><", part)).strip())
+    return "".join(out)
+
+
+# Avoid f-string brace escaping hell: use a plain template with token replacement.
+# Minified once at import; see _minify_html.
+_DUAL_TPL = _minify_html("""<!doctype html>
 <html>
   <head>
     <meta charset='utf-8'/>
@@ -138,6 +138,7 @@ def render_lightweight_chart_dual(
       <div id="bot"></div>
     </div>
     <script>
+      const payload = __PAYLOAD__;
       const topEl = document.getElementById('top');
       const botEl = document.getElementById('bot');
 
@@ -167,15 +168,15 @@ def render_lightweight_chart_dual(
         wickDownColor: '#ef5350',
       });
 
-      const data = __CANDLES__;
+      const data = payload.candles;
       candleSeries.setData(data);
 
-      const markers = __MARKERS__;
+      const markers = payload.markers;
       if (markers && markers.length) {
         candleSeries.setMarkers(markers);
       }
 
-      const smaData = __SMA__;
+      const smaData = payload.sma;
       if (smaData && smaData.length) {
         const smaSeries = chartTop.addLineSeries({
           color: '#2962FF',
@@ -187,7 +188,7 @@ def render_lightweight_chart_dual(
       }
 
       // Bottom: colored histogram for regime
-      const histData = __HIST__;
+      const histData = payload.hist;
       if (histData && histData.length) {
         const hs = chartBot.addHistogramSeries({
           base: 0,
@@ -198,7 +199,7 @@ def render_lightweight_chart_dual(
       }
 
       // Optional direction line
-      const dirData = __DIR__;
+      const dirData = payload.dir;
       if (dirData && dirData.length) {
         const ls = chartBot.addLineSeries({
           color: '#c9d1d9',
@@ -237,15 +238,56 @@ def render_lightweight_chart_dual(
       ro.observe(document.getElementById('wrap'));
     </script>
   </body>
-</html>"""
+</html>""")
 
-    return (
-        tpl.replace("__TOTAL_H__", str(total_h))
-        .replace("__TOP_H__", str(int(height_top)))
-        .replace("__BOT_H__", str(int(height_bottom)))
-        .replace("__CANDLES__", data_json)
-        .replace("__MARKERS__", markers_json)
-        .replace("__SMA__", sma_json)
-        .replace("__HIST__", hist_json)
-        .replace("__DIR__", dir_json)
+# Split once at import into static chunks and token slots; rendering is then a single join
+# instead of one full-string .replace() scan per token.
+_DUAL_PARTS = tuple(
+    re.split(r"(__TOTAL_H__|__TOP_H__|__BOT_H__|__PAYLOAD__)", _DUAL_TPL)
+)
+_DUAL_SLOTS: dict[str, list[int]] = {}
+for _i, _part in enumerate(_DUAL_PARTS):
+    if _i % 2:
+        _DUAL_SLOTS.setdefault(_part, []).append(_i)
+
+
+def render_lightweight_chart_dual(
+    *,
+    candles: list[dict[str, Any]],
+    markers: list[dict[str, Any]] | None = None,
+    regime_hist: list[dict[str, Any]] | None = None,
+    direction_line: list[dict[str, Any]] | None = None,
+    sma_line: list[dict[str, Any]] | None = None,
+    height_top: int = 420,
+    height_bottom: int = 160,
+) -> str:
+    """Two-pane chart with synced time axis.
+
+    Pane 1: Candles (+ trade markers) + optional SMA
+    Pane 2: Regime histogram (colored) + optional direction line
+
+    Both panes stay in sync when zooming/panning either one.
+    """
+
+    markers = markers or []
+    regime_hist = regime_hist or []
+    direction_line = direction_line or []
+    sma_line = sma_line or []
+
+    # all series go out in one serializer call; the script unpacks them from `payload`
+    payload_json = _dumps(
+        {"candles": candles, "markers": markers, "sma": sma_line, "hist": regime_hist, "dir": direction_line}
     )
+
+    total_h = int(height_top) + int(height_bottom)
+
+    parts = list(_DUAL_PARTS)
+    for tok, val in (
+        ("__TOTAL_H__", str(total_h)),
+        ("__TOP_H__", str(int(height_top))),
+        ("__BOT_H__", str(int(height_bottom))),
+        ("__PAYLOAD__", payload_json),
+    ):
+        for i in _DUAL_SLOTS[tok]:
+            parts[i] = val
+    return "".join(parts)
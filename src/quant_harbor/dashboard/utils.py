@@ -1,11 +1,20 @@
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
 
 import pandas as pd
+import pyarrow.parquet as pq
+from pandas.api.types import is_datetime64_any_dtype
+
+try:
+    import orjson  # optional: faster scorecard/summary parsing
+except ImportError:
+    orjson = None
 
 
 @dataclass
@@ -24,53 +33,134 @@ class ScorecardRun:
     sources: Dict[str, Any]
 
 
+class SnapshotBars(NamedTuple):
+    """Snapshot bars in UTC plus the same rows on an ET-naive index (for plotting)."""
+
+    bars_utc: pd.DataFrame
+    bars_et: pd.DataFrame
+
+
 def _read_json(path: Path) -> Optional[Dict[str, Any]]:
     try:
-        return json.loads(path.read_text())
+        raw = path.read_bytes()
+        if orjson is not None:
+            try:
+                return orjson.loads(raw)
+            except orjson.JSONDecodeError:
+                # our writers use json.dumps defaults, so NaN/Infinity can appear;
+                # orjson is strict RFC 8259 and rejects those
+                pass
+        return json.loads(raw)
     except Exception:
         return None
 
 
-def discover_runs(results_dir: Path) -> List[RunSummary]:
-    """Discover legacy per-run summary.json outputs."""
+# path -> (st_mtime_ns, parsed blob). Dashboard reruns rescan results/ constantly;
+# unchanged summary/scorecard files are served from here instead of re-parsed.
+_JSON_CACHE: Dict[Path, Tuple[int, Optional[Dict[str, Any]]]] = {}
+
+
+def _read_json_cached(path: Path) -> Optional[Dict[str, Any]]:
+    """_read_json memoized on file mtime. Returns None if the file is missing."""
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        _JSON_CACHE.pop(path, None)
+        return None
+    hit = _JSON_CACHE.get(path)
+    if hit is not None and hit[0] == mtime:
+        return hit[1]
+    blob = _read_json(path)
+    _JSON_CACHE[path] = (mtime, blob)
+    return blob
+
+
+def _prune_json_cache(results_dir: Path, name: str, seen: Set[Path]) -> None:
+    """Drop cache entries for run dirs that have disappeared from results_dir."""
+    for k in [k for k in _JSON_CACHE if k.name == name and k.parent.parent == results_dir and k not in seen]:
+        del _JSON_CACHE[k]
+
+
+def _as_categories(df: pd.DataFrame, cols: tuple[str, ...]) -> pd.DataFrame:
+    """Store low-cardinality filter columns as categoricals (categories come out sorted)."""
+    for c in cols:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df
+
+
+def _run_dirs(results_dir: Path) -> List[Path]:
+    """Subdirectories of results_dir sorted by name.
+
+    os.scandir's DirEntry.is_dir() uses the d_type from the directory read, so this
+    avoids a stat per entry compared to iterdir() + Path.is_dir().
+    """
+    with os.scandir(results_dir) as it:
+        names = sorted(e.name for e in it if e.is_dir())
+    return [results_dir / n for n in names]
+
+
+def _scan_order(results_dir: Path, top_k: Optional[int]) -> List[Path]:
+    """Run dirs to visit: all of them, or newest-first when only the top_k are wanted.
+
+    Walking newest-first lets callers stop after top_k valid runs instead of parsing every
+    JSON file; dirs without a readable file are skipped, so a fixed nlargest cut could
+    come up short.
+    """
+    dirs = _run_dirs(results_dir)
+    return dirs if top_k is None else dirs[::-1]
+
+
+def discover_runs(results_dir: Path, top_k: Optional[int] = None) -> List[RunSummary]:
+    """Discover legacy per-run summary.json outputs.
+
+    With top_k, only the newest top_k valid runs (by run_id) are parsed and returned.
+    """
     runs: List[RunSummary] = []
     if not results_dir.exists():
         return runs
 
-    for p in sorted(results_dir.iterdir()):
-        if not p.is_dir():
-            continue
+    seen: Set[Path] = set()
+    for p in _scan_order(results_dir, top_k):
+        if top_k is not None and len(runs) >= top_k:
+            break
         s = p / "summary.json"
-        if not s.exists():
-            continue
-        summary = _read_json(s)
+        summary = _read_json_cached(s)
         if not summary:
             continue
+        seen.add(s)
         runs.append(RunSummary(run_id=p.name, path=p, summary=summary))
+    if top_k is None:
+        _prune_json_cache(results_dir, "summary.json", seen)
 
     runs.sort(key=lambda r: r.run_id, reverse=True)
     return runs
 
 
-def discover_scorecards(results_dir: Path) -> List[ScorecardRun]:
-    """Discover scorecard.json outputs (Dashboard v2 primary input)."""
+def discover_scorecards(results_dir: Path, top_k: Optional[int] = None) -> List[ScorecardRun]:
+    """Discover scorecard.json outputs (Dashboard v2 primary input).
+
+    With top_k, only the newest top_k valid runs (by run_id) are parsed and returned.
+    """
     out: List[ScorecardRun] = []
     if not results_dir.exists():
         return out
 
-    for p in sorted(results_dir.iterdir()):
-        if not p.is_dir():
-            continue
+    seen: Set[Path] = set()
+    for p in _scan_order(results_dir, top_k):
+        if top_k is not None and len(out) >= top_k:
+            break
         sc_path = p / "scorecard.json"
-        if not sc_path.exists():
-            continue
-        blob = _read_json(sc_path)
+        blob = _read_json_cached(sc_path)
         if not blob:
             continue
+        seen.add(sc_path)
         meta = blob.get("meta") or {}
         scorecard = blob.get("scorecard") or {}
         sources = blob.get("sources") or {}
         out.append(ScorecardRun(run_id=p.name, path=p, scorecard=scorecard, meta=meta, sources=sources))
+    if top_k is None:
+        _prune_json_cache(results_dir, "scorecard.json", seen)
 
     out.sort(key=lambda r: r.run_id, reverse=True)
     return out
@@ -99,7 +189,7 @@ def runs_to_dataframe(runs: List[RunSummary]) -> pd.DataFrame:
                 "path": str(r.path),
             }
         )
-    return pd.DataFrame(rows)
+    return _as_categories(pd.DataFrame(rows), ("symbol", "strategy"))
 
 
 def scorecards_to_dataframe(runs: List[ScorecardRun]) -> pd.DataFrame:
@@ -129,27 +219,76 @@ def scorecards_to_dataframe(runs: List[ScorecardRun]) -> pd.DataFrame:
                 "path": str(r.path),
             }
         )
-    return pd.DataFrame(rows)
+    return _as_categories(pd.DataFrame(rows), ("symbol", "strategy", "run_kind"))
+
+
+def _read_pq(path: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read parquet via a memory-mapped pyarrow table (pages are mapped, not copied up front)."""
+    table = pq.read_table(path, columns=columns, memory_map=True, pre_buffer=True, use_pandas_metadata=True)
+    return table.to_pandas(self_destruct=True)
 
 
 def load_equity(run_dir: Path) -> Optional[pd.DataFrame]:
     p = run_dir / "equity.parquet"
     if not p.exists():
         return None
-    return pd.read_parquet(p)
+    return _read_pq(p)
 
 
 def load_trades(run_dir: Path) -> Optional[pd.DataFrame]:
     p = run_dir / "trades.parquet"
     if not p.exists():
         return None
-    return pd.read_parquet(p)
+    return _read_pq(p)
+
 
+def to_utc_datetime(s: pd.Series) -> pd.Series:
+    """Parse a timestamp column to tz-aware UTC.
 
-def load_parquet(path: Path) -> Optional[pd.DataFrame]:
+    Trade artifacts store ISO8601 strings, so we pass the explicit format to stay on
+    pandas' fast parser; columns that are already datetime64 are only tz-normalized.
+    """
+    if is_datetime64_any_dtype(s):
+        return pd.to_datetime(s, utc=True)
+    return pd.to_datetime(s, utc=True, format="ISO8601", errors="coerce")
+
+
+def load_parquet(path: Path, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """Read a parquet file, optionally projecting to `columns` (missing ones are skipped).
+
+    Column projection is pushed down to pyarrow, so unused columns are never decoded.
+    """
     if not path.exists():
         return None
-    return pd.read_parquet(path)
+    if columns is not None:
+        avail = set(pq.read_schema(path).names)
+        columns = [c for c in columns if c in avail]
+    return _read_pq(path, columns=columns)
+
+
+@lru_cache(maxsize=256)
+def _find_bars_path(snapshot_dir: str, symbol: str) -> str:
+    # lru_cache does not keep exceptions, so only hits are cached and a miss is re-probed
+    p_multi = Path(snapshot_dir) / f"bars_{symbol}.parquet"
+    if p_multi.exists():
+        return str(p_multi)
+    p_single = Path(snapshot_dir) / "bars.parquet"
+    if p_single.exists():
+        return str(p_single)
+    raise FileNotFoundError(p_multi)
+
+
+def _resolve_bars_path(snapshot_dir: str, symbol: str) -> Optional[str]:
+    """Resolve which bars file a snapshot uses for symbol (None if neither exists).
+
+    Snapshots are write-once, so a found path is cached; a miss is not, so bars written
+    after a first look are picked up. Call _find_bars_path.cache_clear() if a snapshot
+    directory is rewritten in place.
+    """
+    try:
+        return _find_bars_path(snapshot_dir, symbol)
+    except FileNotFoundError:
+        return None
 
 
 def load_snapshot_bars(snapshot_dir: Path, symbol: str) -> Optional[pd.DataFrame]:
@@ -159,14 +298,23 @@ def load_snapshot_bars(snapshot_dir: Path, symbol: str) -> Optional[pd.DataFrame
     - bars.parquet (single symbol)
     - bars_<SYMBOL>.parquet (multi symbol)
     """
-    p_multi = snapshot_dir / f"bars_{symbol}.parquet"
-    p_single = snapshot_dir / "bars.parquet"
-
-    p = p_multi if p_multi.exists() else p_single
-    if not p.exists():
+    p = _resolve_bars_path(str(snapshot_dir), symbol)
+    if p is None:
         return None
 
-    df = pd.read_parquet(p)
+    df = _read_pq(Path(p))
     if df.index.tz is None:
         df.index = pd.to_datetime(df.index, utc=True)
     return df.sort_index()
+
+
+def load_snapshot_bars_et(snapshot_dir: Path, symbol: str) -> Optional[SnapshotBars]:
+    """Like load_snapshot_bars, but also returns an ET-naive view of the same bars.
+
+    The tz conversion is done once here so cached callers don't redo it per rerun.
+    """
+    bars = load_snapshot_bars(snapshot_dir, symbol)
+    if bars is None:
+        return None
+    bars_et = bars.set_axis(bars.index.tz_convert("America/New_York").tz_localize(None), axis=0)
+    return SnapshotBars(bars_utc=bars, bars_et=bars_et)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 
 import pandas as pd
@@ -34,6 +36,22 @@ class WfaGateAggregateConfig:
     min_pass_rate: float = 0.70  # institutions typically want most windows to pass
 
 
+@lru_cache(maxsize=1024)
+def _parse_utc(ts: Any) -> datetime:
+    """Parse a summary timestamp (ISO8601 str) to an aware UTC datetime.
+
+    Uses stdlib fromisoformat on the fast path; falls back to pandas for anything it
+    can't handle. Cached because the same window bounds repeat across candidates.
+    """
+    if isinstance(ts, str):
+        try:
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+        except ValueError:
+            pass
+    return pd.to_datetime(ts, utc=True).to_pydatetime()
+
+
 def apply_gates(summary: Dict[str, Any], cfg: GateConfig) -> Dict[str, Any]:
     """Evaluate hard gates on a single segment summary.
 
@@ -78,8 +96,8 @@ def apply_gates(summary: Dict[str, Any], cfg: GateConfig) -> Dict[str, Any]:
             try:
                 t = int(trades)
                 if dt_min is not None and dt_max is not None:
-                    t0 = pd.to_datetime(dt_min, utc=True)
-                    t1 = pd.to_datetime(dt_max, utc=True)
+                    t0 = _parse_utc(dt_min)
+                    t1 = _parse_utc(dt_max)
                     days = max((t1 - t0).total_seconds() / 86400.0, 1.0)
                     ann_trades = t * (365.25 / days)
                 else:
@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import Dict, Any, List
 
 import numpy as np
+import pandas as pd
 
 
 def compute_trade_metrics(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -29,18 +30,22 @@ def compute_trade_metrics(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
             'trades_annualized': None,
         }
 
-    pnls = np.array([t['pnl_comm'] for t in trades], dtype=float)
-    hold_bars = np.array([t.get('bar_len', 0) for t in trades], dtype=float)
+    # Walk the list-of-dicts once into columns; everything below works on arrays.
+    td = pd.DataFrame.from_records(trades, columns=['pnl_comm', 'bar_len', 'entry_dt', 'exit_dt'])
+    pnls = td['pnl_comm'].to_numpy(dtype=float)
+    hold_bars = td['bar_len'].fillna(0).to_numpy(dtype=float)
 
     # Annualize trade count using time span covered by trades (best-effort).
     trades_annualized = None
     try:
-        import pandas as pd
-
-        entry = pd.to_datetime([t['entry_dt'] for t in trades], utc=True)
-        exit = pd.to_datetime([t['exit_dt'] for t in trades], utc=True)
-        t0 = min(entry.min(), exit.min())
-        t1 = max(entry.max(), exit.max())
+        # one parse over entry+exit stamps; explicit ISO8601 skips format inference
+        dts = pd.to_datetime(
+            np.concatenate([td['entry_dt'].to_numpy(), td['exit_dt'].to_numpy()]),
+            utc=True,
+            format='ISO8601',
+        )
+        t0 = dts.min()
+        t1 = dts.max()
         days = max((t1 - t0).total_seconds() / 86400.0, 1.0)
         trades_annualized = float(len(trades) * (365.25 / days))
     except Exception:
@@ -60,6 +65,9 @@ def compute_trade_metrics(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
 
     avg_hold_bars = float(hold_bars.mean()) if len(hold_bars) else None
 
+    # one sort for all three percentiles instead of one per np.percentile call
+    p05, p50, p95 = np.quantile(pnls, [0.05, 0.5, 0.95])
+
     return {
         'total_trades': int(len(pnls)),
         'gross_profit': gross_profit,
@@ -71,9 +79,9 @@ def compute_trade_metrics(trades: List[Dict[str, Any]]) -> Dict[str, Any]:
         'win_rate_pct': win_rate,
         'best_trade': float(pnls.max()),
         'worst_trade': float(pnls.min()),
-        'pnl_p05': float(np.percentile(pnls, 5)),
-        'pnl_p50': float(np.percentile(pnls, 50)),
-        'pnl_p95': float(np.percentile(pnls, 95)),
+        'pnl_p05': float(p05),
+        'pnl_p50': float(p50),
+        'pnl_p95': float(p95),
         'avg_hold_bars': avg_hold_bars,
         'avg_hold_minutes': (avg_hold_bars * 15.0) if avg_hold_bars is not None else None,
         'trades_annualized': trades_annualized,
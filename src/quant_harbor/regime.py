@@ -1,14 +1,23 @@
 from __future__ import annotations
 
+import hashlib
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Literal
+from typing import Literal, NamedTuple, Optional
 
 import numpy as np
 import pandas as pd
 
+from ._jit import HAVE_NUMBA, njit
+
 
 RegimeLabel = Literal["Uptrend", "Downtrend", "Range", "Neutral", "Trend"]
 
+# Output dtypes of the regime/direction columns; the kernels' int8 codes index these
+# categories directly (direction's -1 is wrapped to the last one, "Down").
+_REGIME_DTYPE = pd.CategoricalDtype(["Neutral", "Range", "Uptrend", "Downtrend"])
+_DIRECTION_DTYPE = pd.CategoricalDtype(["Flat", "Up", "Down"])
+
 
 @dataclass
 class RegimeConfig:
@@ -62,56 +71,282 @@ class RegimeConfig:
     ema_span: int = 20
 
 
-def efficiency_ratio(close: pd.Series, n: int) -> pd.Series:
-    close = close.astype(float)
-    net = (close - close.shift(n)).abs()
-    churn = close.diff().abs().rolling(n).sum()
-    er = net / churn.replace(0.0, np.nan)
-    return er.clip(0.0, 1.0)
+class _RegimeParams(NamedTuple):
+    """RegimeConfig unpacked once into plain ints/floats.
 
+    Both compute_regime paths read this; numba types it as a heterogeneous tuple, which a
+    dataclass instance can't be. EWM spans are already converted to alphas.
+    """
+
+    n_er: int
+    n_adx: int
+    bb_period: int
+    bb_dev: float
+    n_bw: int
+    n_dir: int
+    n_vol: int
+    dir_tanh_k: float
+    dir_alpha: float
+    dir_th: float
+    w_er: float
+    w_adx: float
+    w_bw: float
+    w_dir: float
+    adx_floor: float
+    adx_scale: float
+    trend_alpha: float
+    trend_th: float
+    range_th: float
+    range_dir_abs_th: float
+    n_dir_std: int
+    range_dir_std_th: float
+    trend_dir_abs_th: float
+
+
+def _regime_params(cfg: RegimeConfig) -> _RegimeParams:
+    return _RegimeParams(
+        n_er=int(cfg.n_er),
+        n_adx=int(cfg.n_adx),
+        bb_period=int(cfg.bb_period),
+        bb_dev=float(cfg.bb_dev),
+        n_bw=int(cfg.n_bw),
+        n_dir=int(cfg.n_dir),
+        n_vol=int(cfg.n_vol),
+        dir_tanh_k=float(cfg.dir_tanh_k),
+        dir_alpha=_span_alpha(cfg.dir_ema_span),
+        dir_th=float(cfg.dir_th),
+        w_er=float(cfg.w_er),
+        w_adx=float(cfg.w_adx),
+        w_bw=float(cfg.w_bw),
+        w_dir=float(cfg.w_dir),
+        adx_floor=float(cfg.adx_floor),
+        adx_scale=float(cfg.adx_scale),
+        trend_alpha=_span_alpha(cfg.ema_span),
+        trend_th=float(cfg.trend_th),
+        range_th=float(cfg.range_th),
+        range_dir_abs_th=float(cfg.range_dir_abs_th),
+        n_dir_std=int(cfg.range_dir_std_window),
+        range_dir_std_th=float(cfg.range_dir_std_th),
+        trend_dir_abs_th=float(cfg.trend_dir_abs_th),
+    )
+
+
+def _f64(s: pd.Series) -> pd.Series:
+    """Return s as float64, copying only when it isn't float64 already (bars from parquet are)."""
+    if s.dtype == np.float64:
+        return s
+    return s.astype(np.float64)
+
+
+def _div_nan0(num: pd.Series, den: pd.Series) -> pd.Series:
+    """num / den with NaN where den == 0 (same as den.replace(0, nan)) without copying den."""
+    d = den.to_numpy()
+    out = np.full(d.shape[0], np.nan)
+    np.divide(num.to_numpy(), d, out=out, where=d != 0.0)
+    return pd.Series(out, index=num.index)
 
-def adx(high: pd.Series, low: pd.Series, close: pd.Series, n: int) -> pd.Series:
-    """Wilder ADX (simple pandas implementation)."""
-    high = high.astype(float)
-    low = low.astype(float)
-    close = close.astype(float)
 
-    up = high.diff()
-    down = -low.diff()
+def _span_alpha(span: float) -> float:
+    """ewm(span=...) smoothing factor, as pandas derives it."""
+    return 2.0 / (float(span) + 1.0)
 
-    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
-    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
 
-    tr1 = (high - low).abs()
-    tr2 = (high - close.shift(1)).abs()
-    tr3 = (low - close.shift(1)).abs()
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
+def _ewm(x: pd.Series, alpha: float) -> pd.Series:
+    """ewm(alpha=alpha, adjust=False).mean(), the recurrence _ewm_step implements for the kernels."""
+    return x.ewm(alpha=alpha, adjust=False).mean()
+
+
+@njit(cache=True)
+def _ewm_step(w, old_wt, cur, alpha):
+    """One step of pandas' ewm(alpha=alpha, adjust=False).mean() recurrence (ignore_na=False)."""
+    if w == w:
+        old_wt *= 1.0 - alpha
+        if cur == cur:
+            if w != cur:
+                w = (old_wt * w + alpha * cur) / (old_wt + alpha)
+            old_wt = 1.0
+    elif cur == cur:
+        w = cur
+    return w, old_wt
+
+
+@njit(cache=True)
+def _efficiency_ratio_kernel(c, n):
+    """ER in one pass: running sum of |diff| over a ring buffer plus |c[i] - c[i-n]|.
+
+    A window needs n finite diffs; a window of identical diffs sums exactly (pandas does the
+    same), so flat stretches give churn == 0 and NaN rather than rounding residue.
+    """
+    m = c.shape[0]
+    er = np.full(m, np.nan)
+    ring = np.full(n, np.nan)
+    nobs = 0
+    churn = 0.0
+    prev = np.nan
+    same = 0
+    for i in range(1, m):
+        k = i % n
+        old = ring[k]
+        if old == old:
+            nobs -= 1
+            churn -= old
+        d = abs(c[i] - c[i - 1])
+        ring[k] = d
+        if d == d:
+            if d == prev:
+                same += 1
+            else:
+                same = 1
+            prev = d
+            nobs += 1
+            churn += d
+        if nobs >= n and i >= n:
+            ch = prev * nobs if same >= nobs else churn
+            if ch != 0.0:
+                v = abs(c[i] - c[i - n]) / ch
+                if v > 1.0:
+                    v = 1.0
+                er[i] = v
+    return er
+
+
+@njit(cache=True)
+def _adx_kernel(high, low, close, alpha):
+    """Wilder ADX in one pass: TR/DM, their smoothing, DI, DX and the ADX smoothing.
+
+    Mirrors the pandas path in adx(): the first bar has zero DMs and TR = |high-low|, NaN legs
+    are skipped in the TR max, and DX is NaN wherever the DI division is undefined or infinite.
+    """
+    m = close.shape[0]
+    out = np.empty(m)
+    atr = np.nan
+    pdm_s = np.nan
+    mdm_s = np.nan
+    adx_s = np.nan
+    atr_wt = 1.0
+    pdm_wt = 1.0
+    mdm_wt = 1.0
+    adx_wt = 1.0
+    for i in range(m):
+        h = high[i]
+        lo = low[i]
+        tr = abs(h - lo)
+        pdm = 0.0
+        mdm = 0.0
+        if i > 0:
+            pc = close[i - 1]
+            for leg in (abs(h - pc), abs(lo - pc)):
+                if tr != tr or leg > tr:
+                    tr = leg
+            up = h - high[i - 1]
+            dn = low[i - 1] - lo
+            if up > dn and up > 0.0:
+                pdm = up
+            if dn > up and dn > 0.0:
+                mdm = dn
+
+        atr, atr_wt = _ewm_step(atr, atr_wt, tr, alpha)
+        pdm_s, pdm_wt = _ewm_step(pdm_s, pdm_wt, pdm, alpha)
+        mdm_s, mdm_wt = _ewm_step(mdm_s, mdm_wt, mdm, alpha)
+
+        dx = np.nan
+        if atr > 0.0:
+            pdi = 100.0 * pdm_s / atr
+            mdi = 100.0 * mdm_s / atr
+            tot = pdi + mdi
+            if tot > 0.0 and tot < np.inf:
+                dx = 100.0 * abs(pdi - mdi) / tot
+        adx_s, adx_wt = _ewm_step(adx_s, adx_wt, dx, alpha)
+        out[i] = adx_s
+    return out
+
+
+def efficiency_ratio(close: pd.Series, n: int) -> pd.Series:
+    close = _f64(close)
+    c = close.to_numpy()
+    if HAVE_NUMBA and n > 0:
+        return pd.Series(_efficiency_ratio_kernel(c, int(n)), index=close.index)
 
-    # Wilder smoothing via ewm(alpha=1/n, adjust=False)
-    atr = tr.ewm(alpha=1.0 / n, adjust=False).mean()
+    er = np.full(c.shape[0], np.nan)
+    if n <= 0 or c.shape[0] <= n:
+        return pd.Series(er, index=close.index)
 
-    plus_di = 100.0 * pd.Series(plus_dm, index=close.index).ewm(alpha=1.0 / n, adjust=False).mean() / atr
-    minus_di = 100.0 * pd.Series(minus_dm, index=close.index).ewm(alpha=1.0 / n, adjust=False).mean() / atr
+    # churn = rolling n-sum of |diff| as a difference of prefix sums. NaNs are zeroed in the
+    # sum and counted separately so a window is only valid with n finite diffs (min_periods=n).
+    ad = np.abs(np.diff(c, prepend=np.nan))
+    ok = ~np.isnan(ad)
+    cs = np.concatenate(([0.0], np.cumsum(np.where(ok, ad, 0.0))))
+    cnt = np.concatenate(([0], np.cumsum(ok)))
+    churn = cs[n + 1:] - cs[1:-n]
+    full = (cnt[n + 1:] - cnt[1:-n]) == n
+
+    net = np.abs(c[n:] - c[:-n])
+    np.divide(net, churn, out=er[n:], where=full & (churn != 0.0))
+    return pd.Series(np.clip(er, 0.0, 1.0), index=close.index)
+
+
+def adx(high: pd.Series, low: pd.Series, close: pd.Series, n: int) -> pd.Series:
+    """Wilder ADX (one fused numba pass when available, else the pandas implementation)."""
+    high = _f64(high)
+    low = _f64(low)
+    close = _f64(close)
+
+    if HAVE_NUMBA:
+        return pd.Series(
+            _adx_kernel(high.to_numpy(), low.to_numpy(), close.to_numpy(), 1.0 / n),
+            index=close.index,
+        )
+
+    up = high.diff().to_numpy()
+    down = -low.diff().to_numpy()
+
+    # masked writes into zeroed buffers; multiplying by the mask instead would turn the
+    # leading NaN diff into NaN rather than 0 and shift where the EWMs start
+    plus_dm = np.zeros(len(up))
+    minus_dm = np.zeros(len(up))
+    np.copyto(plus_dm, up, where=(up > down) & (up > 0))
+    np.copyto(minus_dm, down, where=(down > up) & (down > 0))
+
+    # true range on plain arrays; fmax skips NaN like the row-wise DataFrame.max it replaces
+    h = high.to_numpy()
+    lo = low.to_numpy()
+    prev_c = close.shift(1).to_numpy()
+    tr = np.fmax(np.fmax(np.abs(h - lo), np.abs(h - prev_c)), np.abs(lo - prev_c))
+    tr = pd.Series(tr, index=close.index)
+
+    # Wilder smoothing == ewm(alpha=1/n, adjust=False)
+    alpha = 1.0 / n
+    atr = _ewm(tr, alpha)
+
+    plus_di = 100.0 * _ewm(pd.Series(plus_dm, index=close.index), alpha) / atr
+    minus_di = 100.0 * _ewm(pd.Series(minus_dm, index=close.index), alpha) / atr
 
     dx = (100.0 * (plus_di - minus_di).abs() / (plus_di + minus_di)).replace([np.inf, -np.inf], np.nan)
-    adx = dx.ewm(alpha=1.0 / n, adjust=False).mean()
+    adx = _ewm(dx, alpha)
     return adx
 
 
+def _rolling_mean_std(x: pd.Series, n: int) -> tuple[pd.Series, pd.Series]:
+    """rolling(n).mean() and rolling(n).std(ddof=0), via the O(1)-update numba kernel if available."""
+    if HAVE_NUMBA:
+        mu, sd = _rolling_mean_std_kernel(_f64(x).to_numpy(), int(n))
+        return pd.Series(mu, index=x.index), pd.Series(sd, index=x.index)
+    r = x.rolling(n)
+    return r.mean(), r.std(ddof=0)
+
+
 def bollinger_bandwidth(close: pd.Series, period: int, dev: float) -> pd.Series:
-    close = close.astype(float)
-    ma = close.rolling(period).mean()
-    sd = close.rolling(period).std(ddof=0)
+    close = _f64(close)
+    ma, sd = _rolling_mean_std(close, period)
     upper = ma + dev * sd
     lower = ma - dev * sd
-    bw = (upper - lower) / ma.replace(0.0, np.nan)
+    bw = _div_nan0(upper - lower, ma)
     return bw
 
 
 def zscore(x: pd.Series, n: int) -> pd.Series:
-    mu = x.rolling(n).mean()
-    sd = x.rolling(n).std(ddof=0)
-    return (x - mu) / sd.replace(0.0, np.nan)
+    mu, sd = _rolling_mean_std(x, n)
+    return _div_nan0(x - mu, sd)
 
 
 def direction_score(close: pd.Series, n_dir: int, n_vol: int, tanh_k: float) -> pd.Series:
@@ -120,84 +355,461 @@ def direction_score(close: pd.Series, n_dir: int, n_vol: int, tanh_k: float) ->
     We measure n_dir-bar return relative to realized volatility (n_vol-bar std of returns),
     then squash with tanh so extreme values don't dominate.
     """
-    close = close.astype(float)
+    close = _f64(close)
     r = close.pct_change()
     vol = r.rolling(n_vol).std(ddof=0)
     ret_n = close.pct_change(n_dir)
-    z = ret_n / vol.replace(0.0, np.nan)
+    z = _div_nan0(ret_n, vol)
     return np.tanh(float(tanh_k) * z)
 
 
-def compute_regime(df: pd.DataFrame, cfg: RegimeConfig = RegimeConfig()) -> pd.DataFrame:
-    """Compute trend strength + direction for a 15m OHLCV dataframe (UTC-indexed)."""
+# The rolling windows below port pandas' roll_mean / roll_var (pandas/_libs/window/
+# aggregations.pyx) step for step, so the numba path gives the same bits as
+# rolling(n).mean() / .std(ddof=0) -- including the rounding residue pandas leaves on flat
+# windows, which decides whether a z-score there is NaN (std == 0) or a finite number.
+
+# pandas' InvCondTol: an update that leaves under ~3 significant digits of the window's sum
+# of squares triggers a recompute of the window from scratch.
+_INV_COND_TOL = np.finfo(np.float64).eps * 1e3
+
+
+@njit(cache=True)
+def _mean_add(x, ms):
+    # ms = [nobs, sum, neg_ct, comp_add, comp_remove, same, prev]; Kahan sum as add_mean.
+    if x == x:
+        ms[0] += 1.0
+        y = x - ms[3]
+        t = ms[1] + y
+        ms[3] = t - ms[1] - y
+        ms[1] = t
+        if np.signbit(x):
+            ms[2] += 1.0
+        if x == ms[6]:
+            ms[5] += 1.0
+        else:
+            ms[5] = 1.0
+        ms[6] = x
+
+
+@njit(cache=True)
+def _mean_remove(x, ms):
+    if x == x:
+        ms[0] -= 1.0
+        y = -x - ms[4]
+        t = ms[1] + y
+        ms[4] = t - ms[1] - y
+        ms[1] = t
+        if np.signbit(x):
+            ms[2] -= 1.0
+
+
+@njit(cache=True)
+def _roll_mean_at(v, i, n, ms):
+    """rolling(n).mean() of v at i, advancing the window state ms from i - 1."""
+    s = i + 1 - n if i + 1 > n else 0
+    if i == 0 or s >= i:
+        ms[:] = 0.0
+        ms[6] = v[s]
+        for j in range(s, i + 1):
+            _mean_add(v[j], ms)
+    else:
+        if i >= n:
+            _mean_remove(v[i - n], ms)
+        _mean_add(v[i], ms)
+    nobs = ms[0]
+    if nobs < n or nobs == 0.0:
+        return np.nan
+    res = ms[1] / nobs
+    if ms[5] >= nobs:
+        res = ms[6]
+    elif ms[2] == 0.0 and res < 0.0:
+        res = 0.0
+    elif ms[2] == nobs and res > 0.0:
+        res = 0.0
+    return res
+
+
+@njit(cache=True)
+def _var_add(x, vs):
+    # vs = [nobs, mean, ssq, comp_add, comp_remove, unstable]; Welford + Kahan as add_var.
+    if x != x:
+        return
+    prev_m2 = vs[2]
+    vs[0] += 1.0
+    prev_mean = vs[1] - vs[3]
+    y = x - vs[3]
+    t = y - vs[1]
+    vs[3] = t + vs[1] - y
+    vs[1] = vs[1] + t / vs[0]
+    vs[2] = vs[2] + (x - prev_mean) * (x - vs[1])
+    if prev_m2 * _INV_COND_TOL > vs[2]:
+        vs[5] = 1.0
+
+
+@njit(cache=True)
+def _var_remove(x, vs):
+    if x != x:
+        return
+    prev_m2 = vs[2]
+    vs[0] -= 1.0
+    if vs[0] != 0.0:
+        prev_mean = vs[1] - vs[4]
+        y = x - vs[4]
+        t = y - vs[1]
+        vs[4] = t + vs[1] - y
+        vs[1] = vs[1] - t / vs[0]
+        vs[2] = vs[2] - (x - prev_mean) * (x - vs[1])
+        if prev_m2 * _INV_COND_TOL > vs[2]:
+            vs[5] = 1.0
+    else:
+        vs[1] = 0.0
+        vs[2] = 0.0
+        vs[5] = 0.0
+
+
+@njit(cache=True)
+def _roll_std_at(v, i, n, vs):
+    """rolling(n).std(ddof=0) of v at i, advancing the window state vs from i - 1."""
+    s = i + 1 - n if i + 1 > n else 0
+    recompute = i == 0 or s >= i
+    if not recompute:
+        if i >= n:
+            _var_remove(v[i - n], vs)
+        _var_add(v[i], vs)
+    if recompute or vs[5] != 0.0:
+        vs[:] = 0.0
+        for j in range(s, i + 1):
+            _var_add(v[j], vs)
+        vs[5] = 0.0
+    nobs = vs[0]
+    if nobs < n or nobs == 0.0:
+        return np.nan
+    var = vs[2] / nobs
+    # zsqrt: a negative residue is clamped to 0
+    return 0.0 if var < 0.0 else np.sqrt(var)
+
+
+@njit(cache=True)
+def _rolling_mean_std_kernel(x, n):
+    m = x.shape[0]
+    mu = np.empty(m)
+    sd = np.empty(m)
+    ms = np.zeros(7)
+    vs = np.zeros(6)
+    for i in range(m):
+        mu[i] = _roll_mean_at(x, i, n, ms)
+        sd[i] = _roll_std_at(x, i, n, vs)
+    return mu, sd
+
+
+@njit(cache=True)
+def _clip01(v):
+    # like Series.clip(0, 1): NaN passes through
+    if v < 0.0:
+        return 0.0
+    if v > 1.0:
+        return 1.0
+    return v
+
+
+def _regime_kernel_sigs() -> Optional[list]:
+    """Explicit signatures for _regime_kernel, so it is compiled (or loaded from numba's
+    on-disk cache) once at import instead of on the first compute_regime call.
+
+    Column arrays come from Series.to_numpy(), which is read-only under pandas copy-on-write,
+    so both the read-only and writable float64 variants are declared. Returns None (lazy
+    compilation) without numba.
+    """
+    if not HAVE_NUMBA:
+        return None
+    from numba import typeof, types
+
+    params = typeof(_regime_params(RegimeConfig()))  # _regime_params casts every field
+    sigs = []
+    for readonly in (True, False):
+        arr = types.Array(types.float64, 1, "A", readonly=readonly)
+        sigs.append((arr, arr, arr, params))
+    return sigs
+
+
+# Not fastmath: the kernel relies on NaN checks (x != x) that fastmath may fold away.
+@njit(_regime_kernel_sigs(), cache=True, error_model="numpy")
+def _regime_kernel(high, low, close, p):
+    """The whole of compute_regime as one streaming pass over high/low/close.
+
+    Every rolling window is an add/remove state (pandas' own roll_mean/roll_var, or a running
+    sum) and every EWM a scalar recurrence, following the same pandas NaN/min_periods semantics as the pandas path.
+    ADX comes from _adx_kernel, which is its own single pass. `p` is a _RegimeParams.
+    """
+    n_er = p.n_er
+    bb_period = p.bb_period
+    bb_dev = p.bb_dev
+    n_bw = p.n_bw
+    n_dir = p.n_dir
+    n_vol = p.n_vol
+    n_dir_std = p.n_dir_std
+
+    m = close.shape[0]
+    adx_v = _adx_kernel(high, low, close, 1.0 / p.n_adx)
+    trend = np.empty(m)
+    dir_s = np.empty(m)
+    er = np.full(m, np.nan)
+    bw = np.full(m, np.nan)
+    bwz = np.full(m, np.nan)
+    dir_abs = np.empty(m)
+    dir_std = np.full(m, np.nan)
+    dir_code = np.zeros(m, np.int8)
+    regime_code = np.zeros(m, np.int8)
+
+    # |diff| ring buffer; NaN-initialised so removals before a window fills are no-ops
+    d_ring = np.full(n_er, np.nan)
+    ret = np.empty(m)
+
+    # ER churn running sum
+    c_nobs = 0
+    c_sum = 0.0
+    c_prev = np.nan
+    c_same = 0
+    # rolling mean / std window states (see _roll_mean_at / _roll_std_at): close for the
+    # bands, bandwidth for its z-score, returns for realized vol, direction score for dir_std
+    b_ms = np.zeros(7)
+    b_vs = np.zeros(6)
+    z_ms = np.zeros(7)
+    z_vs = np.zeros(6)
+    v_vs = np.zeros(6)
+    s_vs = np.zeros(6)
+    # EWM states
+    ds = np.nan
+    ds_wt = 1.0
+    tr = np.nan
+    tr_wt = 1.0
+
+    for i in range(m):
+        c = close[i]
+        pc = close[i - 1] if i > 0 else np.nan
+
+        # --- efficiency ratio ---
+        k = i % n_er
+        old = d_ring[k]
+        if old == old:
+            c_nobs -= 1
+            c_sum -= old
+        di = abs(c - pc)
+        d_ring[k] = di
+        if di == di:
+            if di == c_prev:
+                c_same += 1
+            else:
+                c_same = 1
+            c_prev = di
+            c_nobs += 1
+            c_sum += di
+        if c_nobs >= n_er and i >= n_er:
+            churn = c_prev * c_nobs if c_same >= c_nobs else c_sum
+            if churn != 0.0:
+                er[i] = _clip01(abs(c - close[i - n_er]) / churn)
+
+        # --- bollinger bandwidth ---
+        ma = _roll_mean_at(close, i, bb_period, b_ms)
+        sd = _roll_std_at(close, i, bb_period, b_vs)
+        if ma != 0.0:
+            bw[i] = ((ma + bb_dev * sd) - (ma - bb_dev * sd)) / ma
+
+        # --- z-score of bandwidth ---
+        mu = _roll_mean_at(bw, i, n_bw, z_ms)
+        sd = _roll_std_at(bw, i, n_bw, z_vs)
+        if sd != 0.0:
+            bwz[i] = (bw[i] - mu) / sd
+
+        # --- direction score: n_dir return vs n_vol realized vol, tanh-squashed, EWM-smoothed ---
+        ret[i] = c / pc - 1.0
+        vol = _roll_std_at(ret, i, n_vol, v_vs)
+        raw = np.nan
+        if i >= n_dir and vol != 0.0:
+            raw = np.tanh(p.dir_tanh_k * ((c / close[i - n_dir] - 1.0) / vol))
+        ds, ds_wt = _ewm_step(ds, ds_wt, raw, p.dir_alpha)
+        dir_s[i] = ds
+        da = abs(ds)
+        dir_abs[i] = da
+
+        # --- trend strength ---
+        trend_raw = (
+            p.w_er * er[i]
+            + p.w_adx * _clip01((adx_v[i] - p.adx_floor) / p.adx_scale)
+            + p.w_bw * _clip01((bwz[i] + 1.0) / 3.0)
+            + p.w_dir * _clip01(da)
+        )
+        tr, tr_wt = _ewm_step(tr, tr_wt, trend_raw, p.trend_alpha)
+        trend[i] = tr
+
+        # --- dir_std ---
+        dir_std[i] = _roll_std_at(dir_s, i, n_dir_std, s_vs)
+
+        # --- codes (see _DIRECTION_DTYPE / _REGIME_DTYPE); NaN compares False throughout ---
+        dc = 0
+        if ds > p.dir_th:
+            dc = 1
+        elif ds < -p.dir_th:
+            dc = -1
+        dir_code[i] = dc
+        if tr > p.trend_th and da >= p.trend_dir_abs_th and dc != 0:
+            regime_code[i] = 2 if dc > 0 else 3
+        elif tr < p.range_th and (da < p.range_dir_abs_th or dir_std[i] > p.range_dir_std_th):
+            regime_code[i] = 1
+
+    return trend, dir_s, er, adx_v, bw, bwz, dir_abs, dir_std, dir_code, regime_code
+
+
+def _compute_regime_numba(df: pd.DataFrame, p: _RegimeParams) -> tuple:
+    return _regime_kernel(
+        _f64(df["high"]).to_numpy(),
+        _f64(df["low"]).to_numpy(),
+        _f64(df["close"]).to_numpy(),
+        p,
+    )
+
+
+def _compute_regime_pandas(df: pd.DataFrame, p: _RegimeParams) -> tuple:
     close = df["close"]
 
     # --- strength components ---
-    er = efficiency_ratio(close, cfg.n_er)
-    adx_v = adx(df["high"], df["low"], close, cfg.n_adx)
+    er = efficiency_ratio(close, p.n_er)
+    adx_v = adx(df["high"], df["low"], close, p.n_adx)
 
     # normalize adx for intraday: clip((ADX-adx_floor)/adx_scale,0,1)
-    adx01 = ((adx_v - float(cfg.adx_floor)) / float(cfg.adx_scale)).clip(0.0, 1.0)
+    adx01 = ((adx_v - p.adx_floor) / p.adx_scale).clip(0.0, 1.0)
 
-    bw = bollinger_bandwidth(close, cfg.bb_period, cfg.bb_dev)
-    bwz = zscore(bw, cfg.n_bw)
+    bw = bollinger_bandwidth(close, p.bb_period, p.bb_dev)
+    bwz = zscore(bw, p.n_bw)
     # clip bandwidth z to [0,1]. Use a wider mapping so typical z values don't all clip to 0.
     # z<=-1 -> 0, z==0 -> 0.33, z==2 -> 1.0
     bw01 = ((bwz + 1.0) / 3.0).clip(0.0, 1.0)
 
     # --- direction (separate from strength) ---
-    dir_s_raw = direction_score(close, cfg.n_dir, cfg.n_vol, cfg.dir_tanh_k)
-    dir_s = dir_s_raw.ewm(span=cfg.dir_ema_span, adjust=False).mean()
+    dir_s_raw = direction_score(close, p.n_dir, p.n_vol, p.dir_tanh_k)
+    dir_s = _ewm(dir_s_raw, p.dir_alpha)
     dir_strength01 = dir_s.abs().clip(0.0, 1.0)
 
     trend_raw = (
-        cfg.w_er * er
-        + cfg.w_adx * adx01
-        + cfg.w_bw * bw01
-        + cfg.w_dir * dir_strength01
+        p.w_er * er
+        + p.w_adx * adx01
+        + p.w_bw * bw01
+        + p.w_dir * dir_strength01
     )
-    trend = trend_raw.ewm(span=cfg.ema_span, adjust=False).mean()
+    trend = _ewm(trend_raw, p.trend_alpha)
 
     # --- labels ---
-    direction_label = pd.Series(
-        np.where(dir_s > cfg.dir_th, "Up", np.where(dir_s < -cfg.dir_th, "Down", "Flat")),
-        index=df.index,
-    )
+    # +1 up / -1 down / 0 flat; -1 maps to the last category of _DIRECTION_DTYPE ("Down").
+    dir_v = dir_s.to_numpy()
+    dir_code = (dir_v > p.dir_th).astype(np.int8) - (dir_v < -p.dir_th).astype(np.int8)
 
     dir_abs = dir_s.abs()
-    dir_std = dir_s.rolling(int(cfg.range_dir_std_window)).std(ddof=0)
+    dir_std = dir_s.rolling(p.n_dir_std).std(ddof=0)
 
-    is_trend_strength = trend > float(cfg.trend_th)
-    is_range_strength = trend < float(cfg.range_th)
+    is_trend_strength = trend > p.trend_th
+    is_range_strength = trend < p.range_th
 
     # Range should be high-confidence: low strength AND (weak direction OR unstable direction)
     is_range = is_range_strength & (
-        (dir_abs < float(cfg.range_dir_abs_th))
-        | (dir_std > float(cfg.range_dir_std_th))
+        (dir_abs < p.range_dir_abs_th)
+        | (dir_std > p.range_dir_std_th)
     )
 
     # Trend direction only when both strength and direction are strong
-    is_trend = is_trend_strength & (dir_abs >= float(cfg.trend_dir_abs_th))
+    is_trend = is_trend_strength & (dir_abs >= p.trend_dir_abs_th)
+
+    # Codes index _REGIME_DTYPE's categories: trend with a direction wins (2 up / 3 down),
+    # else Range (1) or Neutral (0). If strength says trend but direction is ambiguous, it
+    # stays Neutral.
+    is_dir_trend = is_trend.to_numpy() & (dir_code != 0)
+    regime_code = np.where(is_dir_trend, 2 + (dir_code < 0), is_range.to_numpy()).astype(np.int8)
+
+    return (
+        trend.to_numpy(),
+        dir_v,
+        er.to_numpy(),
+        adx_v.to_numpy(),
+        bw.to_numpy(),
+        bwz.to_numpy(),
+        dir_abs.to_numpy(),
+        dir_std.to_numpy(),
+        dir_code,
+        regime_code,
+    )
+
+
+# Recent compute_regime results keyed on bar content + params. Sweeps and dashboard reruns
+# keep asking for the regime of the same bars; a hit skips the whole computation.
+_REGIME_CACHE_SIZE = 8
+_REGIME_CACHE: OrderedDict[tuple, pd.DataFrame] = OrderedDict()
 
-    regime = pd.Series("Neutral", index=df.index, dtype=object)
-    regime[is_range] = "Range"
-    regime[is_trend & (direction_label == "Up")] = "Uptrend"
-    regime[is_trend & (direction_label == "Down")] = "Downtrend"
-    # If strength says trend but direction is ambiguous, keep as Neutral (default).
+
+def _regime_cache_key(df: pd.DataFrame, p: _RegimeParams, dtype: np.dtype) -> Optional[tuple]:
+    """Content key: digest of the index and high/low/close buffers, plus params and output dtype.
+
+    Hashing the buffers is a single O(N) pass with no copies (float64 columns, datetime index)
+    and, unlike id(df), still hits for a fresh frame holding the same bars. The index dtype
+    (unit + tz) and name are part of the key: the cached frame carries its index, so the
+    same bars in UTC and in America/New_York must not share an entry.
+    """
+    asi8 = getattr(df.index, "asi8", None)
+    if asi8 is None or len(df) == 0:
+        return None
+    h = hashlib.blake2b(asi8, digest_size=16)
+    for col in ("high", "low", "close"):
+        h.update(np.ascontiguousarray(_f64(df[col]).to_numpy()))
+    return (len(df), str(df.index.dtype), df.index.name, p, dtype.char, h.digest())
+
+
+def compute_regime(
+    df: pd.DataFrame,
+    cfg: RegimeConfig = RegimeConfig(),
+    dtype: type = np.float64,
+) -> pd.DataFrame:
+    """Compute trend strength + direction for a 15m OHLCV dataframe (UTC-indexed).
+
+    With numba installed the whole computation is one compiled pass (_regime_kernel);
+    otherwise it runs on pandas. Both produce the same columns. Results for the last few
+    distinct (bars, cfg) inputs are cached; callers get a copy they are free to modify.
+    The `regime` and `direction` label columns are categoricals.
+
+    dtype=np.float32 stores the numeric output columns in float32, halving the memory of
+    frames held across a sweep. The computation itself always runs in float64: the running
+    window sums drift visibly in float32 over long histories.
+    """
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"dtype must be float32 or float64, got {dtype}")
+    p = _regime_params(cfg)
+    key = _regime_cache_key(df, p, dtype)
+    if key is not None and key in _REGIME_CACHE:
+        _REGIME_CACHE.move_to_end(key)
+        return _REGIME_CACHE[key].copy()
+
+    if HAVE_NUMBA:
+        parts = _compute_regime_numba(df, p)
+    else:
+        parts = _compute_regime_pandas(df, p)
+    trend, dir_s, er, adx_v, bw, bwz, dir_abs, dir_std, dir_code, regime_code = parts
 
     out = pd.DataFrame(
         {
-            "trend_score": trend.astype(float),
-            "direction_score": dir_s.astype(float),
-            "er": er.astype(float),
-            "adx": adx_v.astype(float),
-            "bw": bw.astype(float),
-            "bw_z": bwz.astype(float),
-            "direction": direction_label,
-            "dir_abs": dir_abs.astype(float),
-            "dir_std": dir_std.astype(float),
-            "regime": regime,
+            "trend_score": trend.astype(dtype, copy=False),
+            "direction_score": dir_s.astype(dtype, copy=False),
+            "er": er.astype(dtype, copy=False),
+            "adx": adx_v.astype(dtype, copy=False),
+            "bw": bw.astype(dtype, copy=False),
+            "bw_z": bwz.astype(dtype, copy=False),
+            "direction": pd.Categorical.from_codes(dir_code % 3, dtype=_DIRECTION_DTYPE),
+            "dir_abs": dir_abs.astype(dtype, copy=False),
+            "dir_std": dir_std.astype(dtype, copy=False),
+            "regime": pd.Categorical.from_codes(regime_code, dtype=_REGIME_DTYPE),
         },
         index=df.index,
     )
-    return out
+    if key is None:
+        return out
+    _REGIME_CACHE[key] = out
+    if len(_REGIME_CACHE) > _REGIME_CACHE_SIZE:
+        _REGIME_CACHE.popitem(last=False)
+    return out.copy()
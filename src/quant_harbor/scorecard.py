@@ -25,15 +25,19 @@ class ScoreWeights:
     impl: float = 5.0
 
 
-def _clip01(x: float) -> float:
-    return float(max(0.0, min(1.0, x)))
+# (x0, x1) bounds for the scorecard's linear 0..1 mappings, in the order scorecard_v1 stacks
+# its inputs: pos_window_rate, basin_pass, dd, ddl, pf, exp, sharpe, netr.
+_MAP_X0 = np.array([0.0, 0.0, 5.0, 500.0, 0.7, -0.05, -1.0, -5.0])
+_MAP_X1 = np.array([0.7, 0.3, 20.0, 5000.0, 1.3, 0.05, 1.0, 5.0])
 
 
-def _linear(x: float, x0: float, x1: float) -> float:
-    """Map x in [x0,x1] to [0,1] (clipped)."""
-    if x1 == x0:
-        return 0.0
-    return _clip01((x - x0) / (x1 - x0))
+def _linear_vec(xs: np.ndarray, x0s: np.ndarray, x1s: np.ndarray) -> np.ndarray:
+    """Map each x linearly so x0 -> 0 and x1 -> 1, clipped to [0, 1] (bounds must differ).
+
+    NaN maps to 1.0, matching the earlier scalar min/max clip.
+    """
+    y = np.clip((xs - x0s) / (x1s - x0s), 0.0, 1.0)
+    return np.where(np.isnan(y), 1.0, y)
 
 
 def _safe_float(x: Any) -> Optional[float]:
@@ -96,12 +100,6 @@ def scorecard_v1(
         missing.append("basin_pass_rate")
         basin_pass = 0.0
 
-    # Map to 0..1. Institutions want pos_window_rate ~>= 0.7.
-    temporal_score = _linear(pos_window_rate, 0.0, 0.7)
-    basin_score = _linear(basin_pass, 0.0, 0.3)  # 30% passing in neighborhood is already decent
-
-    robustness01 = 0.6 * temporal_score + 0.4 * basin_score
-
     # Multiple-comparison penalty / confidence (optional): Deflated Sharpe Ratio
     # If a run provides n_trials + sharpe in sources/meta, we can compute DSR and expose it.
     n_trials = None
@@ -130,9 +128,6 @@ def scorecard_v1(
         missing.append("max_drawdown_intrabar_pct")
         dd = 100.0
 
-    # Score: dd <= 5% is great (1), dd >= 20% is bad (0)
-    risk_dd01 = 1.0 - _linear(dd, 5.0, 20.0)
-
     # Drawdown length (optional): lower better.
     ddl = None
     if val_summary:
@@ -140,13 +135,7 @@ def scorecard_v1(
     if ddl is None and test_summary:
         ddl = _safe_float(test_summary.get("max_drawdown_close_len"))
     if ddl is None:
-        risk_len01 = 0.5
         missing.append("max_drawdown_close_len")
-    else:
-        # Heuristic: <= 500 is good, >= 5000 is poor
-        risk_len01 = 1.0 - _linear(ddl, 500.0, 5000.0)
-
-    risk01 = 0.7 * risk_dd01 + 0.3 * risk_len01
 
     # ---------- Return Quality (0..1) ----------
     # Prefer Val/OOS metrics; fall back to Test.
@@ -177,16 +166,29 @@ def scorecard_v1(
         missing.append("net_return_pct")
         netr = 0.0
 
-    # Map PF: 1.0 -> 0.5, 1.3 -> 1.0
-    pf01 = _clip01((pf - 0.7) / (1.3 - 0.7))
-    # Expectancy (normalized, pct-of-start). Heuristic mapping:
-    # -0.05% -> 0, 0% -> 0.5, +0.05% -> 1.0
-    # (This keeps a reasonable dynamic range for typical per-trade expectancy values.)
-    exp01 = _clip01((exp + 0.05) / 0.10)
-    # Sharpe: 0 -> 0.5, 1.0 -> 1.0
-    sharpe01 = _clip01((sharpe + 1.0) / 2.0)
-    # Net return: -5% -> 0, +5% -> 1
-    netr01 = _linear(netr, -5.0, 5.0)
+    # ---------- 0..1 mappings (one vectorized pass; bounds in _MAP_X0/_MAP_X1) ----------
+    # - pos_window_rate: 0 -> 0, 0.7 -> 1 (institutions want ~>= 0.7)
+    # - basin_pass: 0 -> 0, 0.3 -> 1 (30% passing in neighborhood is already decent)
+    # - dd: <= 5% is great (1), >= 20% is bad (0)  [inverted below]
+    # - ddl: <= 500 is good, >= 5000 is poor  [inverted below; 0.5 when unknown]
+    # - PF: 0.7 -> 0, 1.0 -> 0.5, 1.3 -> 1.0
+    # - expectancy (normalized, pct-of-start): -0.05% -> 0, 0% -> 0.5, +0.05% -> 1.0
+    #   (This keeps a reasonable dynamic range for typical per-trade expectancy values.)
+    # - Sharpe: 0 -> 0.5, 1.0 -> 1.0
+    # - Net return: -5% -> 0, +5% -> 1
+    xs = np.array(
+        [pos_window_rate, basin_pass, dd, 0.0 if ddl is None else ddl, pf, exp, sharpe, netr],
+        dtype=float,
+    )
+    temporal_score, basin_score, dd01, ddl01, pf01, exp01, sharpe01, netr01 = (
+        _linear_vec(xs, _MAP_X0, _MAP_X1).tolist()
+    )
+
+    robustness01 = 0.6 * temporal_score + 0.4 * basin_score
+
+    risk_dd01 = 1.0 - dd01
+    risk_len01 = 0.5 if ddl is None else 1.0 - ddl01
+    risk01 = 0.7 * risk_dd01 + 0.3 * risk_len01
 
     retq01 = 0.35 * pf01 + 0.25 * exp01 + 0.25 * sharpe01 + 0.15 * netr01
 
@@ -38,32 +38,37 @@ class RiskStopPctSizer(bt.Sizer):
         if not isbuy:
             return 0
 
+        p = self.p
+        min_size = int(p.min_size)
         strat = self.strategy
-        price = float(getattr(data, 'close')[0])
+        price = float(data.close[0])
         if not price or not math.isfinite(price) or price <= 0:
             return 0
 
         stop_pct = float(getattr(getattr(strat, 'p', None), 'stop_pct', 0.0) or 0.0)
         if not math.isfinite(stop_pct) or stop_pct <= 0:
-            return int(self.p.min_size)
+            return min_size
 
         value = float(strat.broker.getvalue())
-        risk_budget = value * float(self.p.risk_pct)
+        risk_budget = value * float(p.risk_pct)
         risk_per_share = price * stop_pct
         if risk_per_share <= 0:
-            return int(self.p.min_size)
+            return min_size
 
+        # math.floor(a / b), not a // b: floor division is exact and can land one share
+        # lower when the rounded quotient is a whole number (1 // 0.1 == 9.0)
         size_risk = math.floor(risk_budget / risk_per_share)
 
         # Cash cap
-        max_spend = float(cash) * float(self.p.max_cash_pct)
+        max_spend = float(cash) * float(p.max_cash_pct)
         size_cash = math.floor(max_spend / price)
 
         size = int(max(0, min(size_risk, size_cash)))
 
-        if self.p.max_size is not None:
-            size = int(min(size, int(self.p.max_size)))
+        max_size = p.max_size
+        if max_size is not None:
+            size = int(min(size, int(max_size)))
 
         if size <= 0:
             return 0
-        return max(int(self.p.min_size), size)
+        return max(min_size, size)
@@ -27,6 +27,33 @@ def split_train_val_test_last12m(df_utc: pd.DataFrame) -> SplitResult:
     if df_utc.index.tz is None:
         raise ValueError('df must have tz-aware UTC index')
 
+    idx = df_utc.index
+    if not idx.is_monotonic_increasing:
+        return _split_by_masks(df_utc)
+
+    # Sorted index (the usual case): locate both cuts by binary search and slice positionally.
+    end = idx[-1]
+    cut = end - pd.DateOffset(months=12)
+
+    i_cut = idx.searchsorted(cut, side="left")
+    test = df_utc.iloc[i_cut:]
+    pre = df_utc.iloc[:i_cut]
+
+    if len(pre) == 0:
+        raise ValueError('not enough history before test window')
+
+    # train/val split by time 80/20
+    split_point = idx[0] + (idx[i_cut - 1] - idx[0]) * 0.8
+
+    j = idx.searchsorted(split_point, side="right")
+    train = pre.iloc[:j]
+    val = pre.iloc[j:]
+
+    return SplitResult(train=train, val=val, test=test, cut_test_start_utc=cut)
+
+
+def _split_by_masks(df_utc: pd.DataFrame) -> SplitResult:
+    """split_train_val_test_last12m for an unsorted index (boolean masks, row order kept)."""
     end = df_utc.index.max()
     cut = end - pd.DateOffset(months=12)
 
@@ -3,6 +3,16 @@ from __future__ import annotations
 import math
 from typing import Optional
 
+import numpy as np
+
+try:
+    from scipy.special import ndtr as _ndtr  # optional: vectorized normal CDF
+except ImportError:
+    _ndtr = None
+
+# Sample-size proxy for var(SR): we don't have T robustly, so assume 1 trading year of daily obs.
+_DSR_T_PROXY = 252.0
+
 
 def deflated_sharpe_ratio(
     sharpe: float,
@@ -47,7 +57,7 @@ def deflated_sharpe_ratio(
         # var(SR) ≈ (1 - skew*SR + ((kurtosis-1)/4)*SR^2) / (T-1)
         # Here we don't have T robustly; we approximate using a conservative denom.
         # Treat as scale factor on uncertainty.
-        denom = 252.0  # conservative proxy (1 trading year of daily obs)
+        denom = _DSR_T_PROXY  # conservative proxy (1 trading year of daily obs)
         var = (1.0 - float(skew) * sr + ((float(kurtosis) - 1.0) / 4.0) * (sr ** 2)) / max(denom - 1.0, 1.0)
         sd = math.sqrt(max(var, 1e-12))
 
@@ -62,3 +72,39 @@ def deflated_sharpe_ratio(
         return float(max(0.0, min(1.0, dsr)))
     except Exception:
         return None
+
+
+_erf_ufunc = np.frompyfunc(math.erf, 1, 1)
+
+
+def _norm_cdf(z: np.ndarray) -> np.ndarray:
+    if _ndtr is not None:
+        return _ndtr(z)
+    return 0.5 * (1.0 + _erf_ufunc(z / math.sqrt(2.0)).astype(float))
+
+
+def deflated_sharpe_ratio_vec(
+    sharpe,
+    n_trials,
+    skew=0.0,
+    kurtosis=3.0,
+    sr_ref=0.0,
+) -> np.ndarray:
+    """Vectorized deflated_sharpe_ratio for scoring many candidates in one call.
+
+    All inputs broadcast against each other. Returns a float array; entries with n_trials < 2
+    (where the scalar version returns None) are NaN. Uses scipy's ndtr when installed.
+    """
+    sr, n, sk, ku, ref = np.broadcast_arrays(
+        *(np.asarray(a, dtype=float) for a in (sharpe, n_trials, skew, kurtosis, sr_ref))
+    )
+    n = np.trunc(n)
+    ok = n >= 2.0
+
+    emax = np.sqrt(2.0 * np.log(np.where(ok, n, 2.0)))
+    var = (1.0 - sk * sr + ((ku - 1.0) / 4.0) * (sr ** 2)) / max(_DSR_T_PROXY - 1.0, 1.0)
+    sd = np.sqrt(np.maximum(var, 1e-12))
+    z = (sr - (ref + emax * sd)) / sd
+
+    dsr = np.clip(_norm_cdf(z), 0.0, 1.0)
+    return np.where(ok, dsr, np.nan)
@@ -21,19 +21,26 @@ class LongBracketMixin:
     """
 
     def _reset_orders(self):
+        # Strategies call this from __init__; the order attributes below are read directly.
         self.order_entry = None
         self.order_stop = None
         self.order_take = None
 
     def _cancel_children(self):
-        for o in [getattr(self, "order_stop", None), getattr(self, "order_take", None)]:
-            if o is not None:
-                try:
-                    self.cancel(o)
-                except Exception:
-                    pass
-        self.order_stop = None
-        self.order_take = None
+        o = self.order_stop
+        if o is not None:
+            try:
+                self.cancel(o)
+            except Exception:
+                pass
+            self.order_stop = None
+        o = self.order_take
+        if o is not None:
+            try:
+                self.cancel(o)
+            except Exception:
+                pass
+            self.order_take = None
 
     def _submit_children(self, entry_price: float, stop_pct: float, take_pct: float):
         """Submit exit children after entry fill.
@@ -87,11 +94,11 @@ class LongBracketMixin:
 
         if order.status in [order.Canceled, order.Margin, order.Rejected]:
             # clear references if needed
-            if order is getattr(self, "order_entry", None):
+            if order is self.order_entry:
                 self.order_entry = None
-            if order is getattr(self, "order_stop", None):
+            if order is self.order_stop:
                 self.order_stop = None
-            if order is getattr(self, "order_take", None):
+            if order is self.order_take:
                 self.order_take = None
             return
 
@@ -109,15 +116,15 @@ class LongBracketMixin:
                 # If this was a manual close (self.close()), it is stored in order_entry.
                 # Always clear it on completion, otherwise strategies that gate on
                 # `if self.order_entry is not None: return` will freeze forever.
-                oe = getattr(self, "order_entry", None)
+                oe = self.order_entry
                 if oe is not None and getattr(order, 'ref', None) == getattr(oe, 'ref', None):
                     self.order_entry = None
 
                 # cancel the other child
-                if order is getattr(self, "order_stop", None):
+                if order is self.order_stop:
                     self.order_stop = None
                     self._cancel_children()
-                elif order is getattr(self, "order_take", None):
+                elif order is self.order_take:
                     self.order_take = None
                     self._cancel_children()
                 else:
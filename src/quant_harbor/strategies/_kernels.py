@@ -0,0 +1,268 @@
+"""Whole-feed indicator arrays for strategies.
+
+Cerebro preloads data feeds (preload=True, the default) before strategies are built, so a
+strategy can compute its indicators once over the full price arrays in __init__ and have
+next() read element len(self) - 1, instead of driving backtrader line objects bar by bar.
+
+Each function mirrors the backtrader indicator it replaces: same warmup (NaN until the
+indicator's minperiod), same seeding and recurrences. Rolling means/stds are computed with
+running sums (bottleneck when installed, else pandas) rather than backtrader's per-window
+fsum, so they agree to float rounding.
+The smoothing recurrences are numba kernels when numba is installed (see .._jit).
+"""
+from __future__ import annotations
+
+import math
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from .._jit import HAVE_NUMBA, njit
+
+try:
+    import bottleneck as bn  # optional: C moving-window mean/std, several times faster than pandas rolling
+except ImportError:
+    bn = None
+
+
+def line_array(line) -> np.ndarray:
+    """Copy of a preloaded backtrader line as float64 (index i == bar i)."""
+    arr = np.array(line.array, dtype=np.float64)
+    if arr.size == 0:
+        raise RuntimeError("strategy needs preloaded data feeds (Cerebro(preload=True), the default)")
+    return arr
+
+
+# backtrader datetime floats are days since 0001-01-01 (date.toordinal() + day fraction)
+_BT_UNIX_EPOCH = 719163.0
+
+
+def line_view(line) -> np.ndarray:
+    """Writable float64 view (no copy) of a backtrader line's array('d') buffer."""
+    return np.frombuffer(line.array, dtype=np.float64)
+
+
+class OHLCV(NamedTuple):
+    """Per-field price arrays of a feed; rows of one (5, N) float64 block."""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+def ohlcv(data) -> OHLCV:
+    """All five OHLCV lines of a preloaded feed in one allocation.
+
+    Each field is a contiguous float64 row (what the kernels below want), and next() can
+    index them by bar instead of going through data.<line>[0].
+    """
+    n = len(data.close.array)
+    if n == 0:
+        raise RuntimeError("strategy needs preloaded data feeds (Cerebro(preload=True), the default)")
+    block = np.empty((5, n), dtype=np.float64)
+    for row, name in zip(block, OHLCV._fields):
+        row[:] = getattr(data, name).array
+    return OHLCV(*block)
+
+
+def sma(x: np.ndarray, period: int) -> np.ndarray:
+    """bt.indicators.SMA."""
+    if bn is not None:
+        return bn.move_mean(x, period, min_count=period)
+    return pd.Series(x).rolling(period).mean().to_numpy()
+
+
+def sma_std(x: np.ndarray, period: int) -> tuple[np.ndarray, np.ndarray]:
+    """(SMA, population StdDev) over `period`, like bt.indicators.SMA / StdDev."""
+    if bn is not None:
+        return bn.move_mean(x, period, min_count=period), bn.move_std(x, period, min_count=period, ddof=0)
+    r = pd.Series(x).rolling(period)
+    return r.mean().to_numpy(), r.std(ddof=0).to_numpy()
+
+
+def bbands(close: np.ndarray, period: int, dev: float) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """bt.indicators.BollingerBands: (mid, bot, top)."""
+    mid, std = sma_std(close, period)
+    return mid, mid - dev * std, mid + dev * std
+
+
+def rolling_zscore(x: np.ndarray, period: int, eps: float) -> np.ndarray:
+    """(x - SMA) / (StdDev + eps), the z-score the mean-reversion strategies trade on."""
+    mean, std = sma_std(x, period)
+    return (x - mean) / (std + eps)
+
+
+@njit(cache=True)
+def _smooth_kernel(x, out, start, alpha):
+    """out[i] = out[i-1] * (1 - alpha) + x[i] * alpha for i >= start; out[start-1] is the seed."""
+    alpha1 = 1.0 - alpha
+    prev = out[start - 1]
+    for i in range(start, len(x)):
+        prev = prev * alpha1 + x[i] * alpha
+        out[i] = prev
+    return out
+
+
+def _exp_smooth(x: np.ndarray, period: int, alpha: float, first: int) -> np.ndarray:
+    """backtrader ExponentialSmoothing: seeded with the mean of x[first:first+period]."""
+    out = np.full(len(x), np.nan)
+    seed_i = first + period - 1
+    if seed_i >= len(x):
+        return out
+    # exact (fsum) seed like backtrader's Average; numba has no fsum, so it's taken here
+    out[seed_i] = math.fsum(x[first:seed_i + 1]) / period
+    return _smooth_kernel(x, out, seed_i + 1, alpha)
+
+
+def ema(x: np.ndarray, period: int) -> np.ndarray:
+    """bt.indicators.EMA (alpha = 2 / (period + 1), SMA seed)."""
+    return _exp_smooth(x, period, 2.0 / (1.0 + period), 0)
+
+
+def roc(x: np.ndarray, period: int) -> np.ndarray:
+    """bt.indicators.ROC: (x - x[-period]) / x[-period]."""
+    out = np.full(len(x), np.nan)
+    if period < len(x):
+        out[period:] = (x[period:] - x[:-period]) / x[:-period]
+    return out
+
+
+def atr(high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int) -> np.ndarray:
+    """bt.indicators.ATR: SMMA of the true range (first TR needs the previous close)."""
+    tr = np.empty(len(close))
+    tr[:1] = np.nan
+    tr[1:] = np.maximum(high[1:], close[:-1]) - np.minimum(low[1:], close[:-1])
+    return _exp_smooth(tr, period, 1.0 / period, 1)
+
+
+def _supertrend_kernel_sigs():
+    """One explicit signature for _supertrend_kernel, compiled (or loaded from numba's
+    on-disk cache) at import.
+
+    Inputs are typed read-only "A" arrays, which writable and strided arrays also convert
+    to, so line-buffer views from SuperTrendIndicator.once(), feed copies and read-only
+    pandas arrays share one compiled specialization instead of adding one each. None
+    (lazy compilation) without numba.
+    """
+    if not HAVE_NUMBA:
+        return None
+    from numba import types
+
+    src = types.Array(types.float64, 1, "A", readonly=True)
+    out = types.Array(types.float64, 1, "A")
+    return [(src, src, src, types.int64, out, out, out, out)]
+
+
+@njit(_supertrend_kernel_sigs(), cache=True)
+def _supertrend_kernel(close, bu, bl, first, st, dir_, upper, lower):
+    """SuperTrendIndicator.next() over bars first.. (outputs come in NaN-filled)."""
+    for i in range(first, len(close)):
+        if math.isnan(bu[i]) or math.isnan(bl[i]):
+            if i > 0:
+                dir_[i] = dir_[i - 1]
+            continue
+        if i == 0 or math.isnan(dir_[i - 1]):
+            upper[i] = bu[i]
+            lower[i] = bl[i]
+            dir_[i] = 1.0
+            st[i] = bl[i]
+            continue
+        prev_upper = upper[i - 1]
+        prev_lower = lower[i - 1]
+        prev_close = close[i - 1]
+        if math.isnan(prev_upper) or bu[i] < prev_upper or prev_close > prev_upper:
+            fu = bu[i]
+        else:
+            fu = prev_upper
+        if math.isnan(prev_lower) or bl[i] > prev_lower or prev_close < prev_lower:
+            fl = bl[i]
+        else:
+            fl = prev_lower
+        upper[i] = fu
+        lower[i] = fl
+        d = dir_[i - 1]
+        if d > 0 and close[i] < fl:
+            d = -1.0
+        elif d < 0 and close[i] > fu:
+            d = 1.0
+        dir_[i] = d
+        st[i] = fl if d > 0 else fu
+
+
+def supertrend(
+    high: np.ndarray, low: np.ndarray, close: np.ndarray, period: int, multiplier: float
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """SuperTrendIndicator (.supertrend): (st, dir, upper, lower), NaN before bar `period`."""
+    a = atr(high, low, close, period)
+    hl2 = (high + low) / 2.0
+    bu = hl2 + multiplier * a
+    bl = hl2 - multiplier * a
+    n = len(close)
+    st, dir_, upper, lower = (np.full(n, np.nan) for _ in range(4))
+    _supertrend_kernel(close, bu, bl, period, st, dir_, upper, lower)
+    return st, dir_, upper, lower
+
+
+def wilder_rsi(close: np.ndarray, period: int, safediv: bool = False) -> np.ndarray:
+    """bt.indicators.RSI: SMMA of up/down days (alpha = 1/period).
+
+    With safediv, x/0 gives 100 and 0/0 gives 50 (backtrader's safehigh/safelow); without
+    it a zero average loss gives inf/NaN where backtrader would raise.
+    """
+    diff = np.empty(len(close))
+    diff[0] = np.nan
+    diff[1:] = close[1:] - close[:-1]
+    up = np.maximum(diff, 0.0)
+    down = np.maximum(-diff, 0.0)
+    maup = _exp_smooth(up, period, 1.0 / period, 1)
+    madown = _exp_smooth(down, period, 1.0 / period, 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = maup / madown
+    if safediv:
+        zero = madown == 0.0
+        rs[zero & (maup != 0.0)] = np.inf
+        rs[zero & (maup == 0.0)] = 1.0
+    return 100.0 - 100.0 / (1.0 + rs)
+
+
+def crossover(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """bt.indicators.CrossOver: +1 where a crosses above b, -1 below, else 0.
+
+    A cross needs the last non-zero a - b before the bar to have the opposite sign.
+    """
+    d = a - b
+    # last non-zero difference; zeros and warmup NaNs both fail the < 0 / > 0 tests below
+    nzd = pd.Series(np.where(d != 0.0, d, np.nan)).ffill().to_numpy()
+    prev = np.empty(len(d))
+    prev[:1] = np.nan
+    prev[1:] = nzd[:-1]
+    out = np.zeros(len(d))
+    out[(prev < 0.0) & (a > b)] = 1.0
+    out[(prev > 0.0) & (a < b)] = -1.0
+    return out
+
+
+def session_vwap(close: np.ndarray, volume: np.ndarray, dt: np.ndarray, tz=None) -> np.ndarray:
+    """IntradayVWAP: running sum(close * volume) / sum(volume), restarted every session.
+
+    Sessions are the dates of the backtrader datetime floats `dt` in `tz` (UTC if None),
+    i.e. what data.datetime.date(0) returns. Until a session has volume, VWAP is the close.
+    """
+    # whole seconds: num2date snaps the float's few-microsecond error the same way
+    t = pd.to_datetime(np.round((dt - _BT_UNIX_EPOCH) * 86400.0), unit="s", utc=True)
+    if tz is not None:
+        t = t.tz_convert(tz)
+    day = t.tz_localize(None).normalize().asi8
+    bounds = np.flatnonzero(np.diff(day)) + 1
+
+    pv = close * volume
+    out = np.empty(len(close))
+    # np.cumsum adds sequentially, so each session matches the bar-by-bar running sums
+    for a, b in zip(np.r_[0, bounds], np.r_[bounds, len(close)]):
+        cum_v = np.cumsum(volume[a:b])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[a:b] = np.where(cum_v > 0, np.cumsum(pv[a:b]) / cum_v, close[a:b])
+    return out
@@ -0,0 +1,257 @@
+"""Event-loop-free parameter sweeps, for ranking a grid before full backtests.
+
+A sweep walks the bars once per parameter row with a small state machine instead of
+running Cerebro, and the rows run in parallel (numba prange). Fills follow backtrader's
+bar semantics closely enough to rank configs, but sizing, cash and commission are left
+out: returns are per unit notional. Promote the top rows to run_backtest_df/run_grid
+for the real numbers.
+
+simulate_long is the same state machine for a single run that returns the trades, for
+strategies whose decisions reduce to per-bar entry/exit masks.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .._jit import HAVE_NUMBA, njit, prange
+from ._kernels import wilder_rsi
+
+# columns of the metrics array returned by the sweeps
+SWEEP_METRICS = ("net_return", "n_trades", "win_rate", "profit_factor")
+
+
+@njit(cache=True)
+def _sim_rsi2_one(open_, high, low, close, rsi, entry_rsi, stop_pct, take_pct, max_hold, brackets, slip, out):
+    """RSI2Daytrade on one param row; writes SWEEP_METRICS into out.
+
+    A signal on bar i (flat, nothing pending) is a market buy filled at bar i+1's open.
+    Exits, depending on `brackets`:
+    - False: time stop. next() closes on the bar max_hold bars after the fill, filled at
+      the following open. This is what backtest_runner produces: RiskStopPctSizer sizes
+      sells at 0, so LongBracketMixin's stop/take children are never placed.
+    - True: stop/take children placed on the fill bar and live from the next bar, stop
+      checked first, gaps through a level filled at the open. next() waits on them, so
+      the time stop never fires.
+    A new signal is read on the exit fill bar; a trade still open at the end is marked
+    to the last close.
+    """
+    n = len(close)
+    gains = 0.0
+    losses = 0.0
+    n_trades = 0
+    n_wins = 0
+    net = 0.0
+    i = 0
+    while i < n - 1:
+        if not rsi[i] < entry_rsi:
+            i += 1
+            continue
+        j = i + 1
+        entry = min(open_[j] * (1.0 + slip), high[j])
+        if brackets:
+            stop = entry * (1.0 - stop_pct)
+            take = entry * (1.0 + take_pct) if take_pct > 0 else np.inf
+            exit_px = close[n - 1]
+            k = j + 1
+            while k < n:
+                if open_[k] <= stop:
+                    exit_px = max(open_[k] * (1.0 - slip), low[k])
+                    break
+                if low[k] <= stop:
+                    exit_px = max(stop * (1.0 - slip), low[k])
+                    break
+                if open_[k] >= take:
+                    exit_px = max(open_[k] * (1.0 - slip), take)
+                    break
+                if high[k] >= take:
+                    exit_px = take
+                    break
+                k += 1
+        else:
+            k = j + max_hold + 1
+            if k < n:
+                exit_px = max(open_[k] * (1.0 - slip), low[k])
+            else:
+                exit_px = close[n - 1]
+        r = exit_px / entry - 1.0
+        net += r
+        n_trades += 1
+        if r > 0:
+            n_wins += 1
+            gains += r
+        else:
+            losses -= r
+        i = k
+    out[0] = net
+    out[1] = n_trades
+    out[2] = n_wins / n_trades if n_trades else np.nan
+    out[3] = gains / losses if losses > 0 else np.inf if gains > 0 else np.nan
+
+
+@njit(parallel=True, cache=True)
+def _sweep_rsi2_kernel(open_, high, low, close, rsi_rows, rsi_idx, params, brackets, slip):
+    out = np.empty((params.shape[0], len(SWEEP_METRICS)))
+    for k in prange(params.shape[0]):
+        _sim_rsi2_one(
+            open_, high, low, close, rsi_rows[rsi_idx[k]],
+            params[k, 1], params[k, 2], params[k, 3], int(params[k, 4]), brackets, slip, out[k],
+        )
+    return out
+
+
+# column order of sweep_rsi2's params rows (the _RSI2 registry grid keys)
+RSI2_SWEEP_PARAMS = ("rsi_period", "entry_rsi", "stop_pct", "take_pct", "max_bars_hold")
+
+
+def sweep_rsi2(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    params: np.ndarray,
+    slippage_bps_side: float = 0.0,
+    brackets: bool = False,
+) -> np.ndarray:
+    """Sweep RSI2Daytrade over params rows laid out as RSI2_SWEEP_PARAMS.
+
+    Returns an array of shape (len(params), len(SWEEP_METRICS)). RSI (safediv, like the
+    strategy) is computed once per distinct period and shared by the rows using it.
+    See _sim_rsi2_one for `brackets`.
+    """
+    params = np.ascontiguousarray(params, dtype=np.float64)
+    if params.ndim != 2 or params.shape[1] != len(RSI2_SWEEP_PARAMS):
+        raise ValueError(f"params must have shape (n, {len(RSI2_SWEEP_PARAMS)}): {', '.join(RSI2_SWEEP_PARAMS)}")
+    cols = [np.ascontiguousarray(x, dtype=np.float64) for x in (open_, high, low, close)]
+    periods, rsi_idx = np.unique(params[:, 0].astype(np.int64), return_inverse=True)
+    rsi_rows = np.stack([wilder_rsi(cols[3], int(p), safediv=True) for p in periods])
+    return _sweep_rsi2_kernel(
+        *cols, rsi_rows, rsi_idx.astype(np.int64), params, bool(brackets), float(slippage_bps_side) / 10000.0
+    )
+
+
+# exit_reason labels of simulate_long, by kernel code
+_EXIT_REASONS = ("signal", "time_stop", "stop", "take_profit", "open")
+
+
+def _simulate_long_kernel_sigs():
+    """The one signature simulate_long calls _simulate_long_kernel with, compiled (or
+    loaded from numba's on-disk cache) at import, like _kernels._supertrend_kernel_sigs,
+    so a WFA worker's first run doesn't pay for type inference and compilation.
+    Read-only "A" inputs cover the read-only arrays pandas hands out and writable masks
+    alike. None (lazy compilation) without numba.
+    """
+    if not HAVE_NUMBA:
+        return None
+    from numba import types
+
+    f8 = types.Array(types.float64, 1, "A", readonly=True)
+    b1 = types.Array(types.boolean, 1, "A", readonly=True)
+    return [(f8, f8, f8, f8, b1, b1, types.int64, types.float64, types.float64, types.boolean, types.float64)]
+
+
+@njit(_simulate_long_kernel_sigs(), cache=True)
+def _simulate_long_kernel(open_, high, low, close, enter, exit_, max_hold, stop_pct, take_pct, brackets, slip):
+    """One long-only LongBracketMixin strategy driven by per-bar entry/exit masks.
+
+    Entries and brackets fill as in _sim_rsi2_one. Without brackets, next() closes on the
+    first bar from the fill bar on where exit_ is set or max_hold bars have passed (exit_
+    checked first), filled at the following open. Returns per-trade entry bar, exit bar,
+    entry price, exit price and _EXIT_REASONS code; an open trade is marked to the last
+    close with exit bar n - 1.
+    """
+    n = len(close)
+    cap = n // 2 + 1
+    e_bar = np.empty(cap, np.int64)
+    x_bar = np.empty(cap, np.int64)
+    e_px = np.empty(cap)
+    x_px = np.empty(cap)
+    code = np.empty(cap, np.int8)
+    m = 0
+    i = 0
+    while i < n - 1:
+        if not enter[i]:
+            i += 1
+            continue
+        j = i + 1
+        entry = min(open_[j] * (1.0 + slip), high[j])
+        exit_px = close[n - 1]
+        reason = 4
+        if brackets:
+            stop = entry * (1.0 - stop_pct)
+            take = entry * (1.0 + take_pct) if take_pct > 0 else np.inf
+            k = j + 1
+            while k < n:
+                if open_[k] <= stop:
+                    exit_px = max(open_[k] * (1.0 - slip), low[k])
+                    reason = 2
+                    break
+                if low[k] <= stop:
+                    exit_px = max(stop * (1.0 - slip), low[k])
+                    reason = 2
+                    break
+                if open_[k] >= take:
+                    exit_px = max(open_[k] * (1.0 - slip), take)
+                    reason = 3
+                    break
+                if high[k] >= take:
+                    exit_px = take
+                    reason = 3
+                    break
+                k += 1
+        else:
+            t = j
+            while t < n - 1 and not exit_[t] and t - j < max_hold:
+                t += 1
+            k = t + 1
+            if k < n:
+                exit_px = max(open_[k] * (1.0 - slip), low[k])
+                reason = 0 if exit_[t] else 1
+        e_bar[m] = j
+        x_bar[m] = min(k, n - 1)
+        e_px[m] = entry
+        x_px[m] = exit_px
+        code[m] = reason
+        m += 1
+        i = k
+    return e_bar[:m], x_bar[:m], e_px[:m], x_px[:m], code[:m]
+
+
+def simulate_long(
+    bars: pd.DataFrame,
+    enter: np.ndarray,
+    exit_: np.ndarray,
+    max_bars_hold: int,
+    stop_pct: float = 0.0,
+    take_pct: float = 0.0,
+    slippage_bps_side: float = 0.0,
+    brackets: bool = False,
+) -> pd.DataFrame:
+    """Trades of a long-only strategy given its per-bar entry/exit masks, without Cerebro.
+
+    bars needs open/high/low/close columns; enter/exit_ are aligned with its rows. See
+    _simulate_long_kernel for `brackets` (backtest_runner's sizer never places the
+    bracket children, so the default matches its trades). Returns one row per trade with
+    entry_dt, exit_dt, entry_price, exit_price, bar_len, exit_reason and the per-unit
+    return; exit_reason "open" is a trade still open on the last bar.
+    """
+    cols = [np.ascontiguousarray(bars[c].to_numpy(), dtype=np.float64) for c in ("open", "high", "low", "close")]
+    enter = np.ascontiguousarray(enter, dtype=np.bool_)
+    exit_ = np.ascontiguousarray(exit_, dtype=np.bool_)
+    if len(enter) != len(bars) or len(exit_) != len(bars):
+        raise ValueError("enter/exit_ must have one value per bar")
+    e_bar, x_bar, e_px, x_px, code = _simulate_long_kernel(
+        *cols, enter, exit_, int(max_bars_hold), float(stop_pct), float(take_pct), bool(brackets),
+        float(slippage_bps_side) / 10000.0,
+    )
+    return pd.DataFrame(
+        {
+            "entry_dt": bars.index[e_bar],
+            "exit_dt": bars.index[x_bar],
+            "entry_price": e_px,
+            "exit_price": x_px,
+            "bar_len": x_bar - e_bar,
+            "exit_reason": pd.Categorical.from_codes(code, categories=list(_EXIT_REASONS)),
+            "return": x_px / e_px - 1.0,
+        }
+    )
@@ -3,6 +3,7 @@ from __future__ import annotations
 import backtrader as bt
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import bbands, line_array
 
 
 class BollingerMR(LongBracketMixin, bt.Strategy):
@@ -33,27 +34,31 @@ class BollingerMR(LongBracketMixin, bt.Strategy):
     )
 
     def __init__(self):
-        self.bb = bt.indicators.BollingerBands(self.data.close, period=self.p.bb_period, devfactor=self.p.bb_dev)
+        self.close_arr = line_array(self.data.close)
+        self.bb_mid, self.bb_bot, _ = bbands(self.close_arr, int(self.p.bb_period), float(self.p.bb_dev))
         self._reset_orders()
         self.entry_bar = None
         self.entry_price = None
+        self._max_hold = self.p.max_bars_hold
 
     def next(self):
         if self.order_entry or self.order_stop or self.order_take:
             return
 
+        n = len(self)
+        i = n - 1
         if not self.position:
-            if self.data.close[0] < self.bb.bot[0]:
+            if self.close_arr[i] < self.bb_bot[i]:
                 self.order_entry = self.buy()
             return
 
         # Mean reversion exit
-        if self.data.close[0] >= self.bb.mid[0]:
+        if self.close_arr[i] >= self.bb_mid[i]:
             self._cancel_children()
             self.order_entry = self.close()
             return
 
         # Time stop
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= self.p.max_bars_hold:
+        if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close()
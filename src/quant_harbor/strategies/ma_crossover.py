@@ -3,6 +3,7 @@ from __future__ import annotations
 import backtrader as bt
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import crossover, ema, line_array, sma
 
 
 class MovingAverageCrossover(LongBracketMixin, bt.Strategy):
@@ -39,33 +40,33 @@ class MovingAverageCrossover(LongBracketMixin, bt.Strategy):
         self.entry_bar = None
         self.entry_price = None
 
-        ma_type = str(self.p.ma_type).lower()
-        if ma_type == "ema":
-            self.fast_ma = bt.indicators.EMA(self.data.close, period=self.p.fast)
-            self.slow_ma = bt.indicators.EMA(self.data.close, period=self.p.slow)
-        else:
-            self.fast_ma = bt.indicators.SMA(self.data.close, period=self.p.fast)
-            self.slow_ma = bt.indicators.SMA(self.data.close, period=self.p.slow)
+        close = line_array(self.data.close)
+        ma = ema if str(self.p.ma_type).lower() == "ema" else sma
+        self.fast_ma = ma(close, int(self.p.fast))
+        self.slow_ma = ma(close, int(self.p.slow))
 
-        self.cross = bt.indicators.CrossOver(self.fast_ma, self.slow_ma)
+        self.cross = crossover(self.fast_ma, self.slow_ma)
+        self._max_hold = int(self.p.max_bars_hold)
 
     def next(self):
         if self.order_entry or self.order_stop or self.order_take:
             return
 
+        n = len(self)
+        cross = self.cross[n - 1]
         if not self.position:
-            if self.cross[0] > 0:
+            if cross > 0:
                 self.order_entry = self.buy()
             return
 
         # exit on cross down
-        if self.cross[0] < 0:
+        if cross < 0:
             self._cancel_children()
             self.order_entry = self.close()
             return
 
         # time stop
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= int(self.p.max_bars_hold):
+        if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close()
             return
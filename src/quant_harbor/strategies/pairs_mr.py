@@ -2,6 +2,8 @@ from __future__ import annotations
 
 import backtrader as bt
 
+from ._kernels import line_array, rolling_zscore
+
 
 class PairsZScoreMR(bt.Strategy):
     """Pairs trading on ratio z-score (market-neutral template).
@@ -41,44 +43,58 @@ class PairsZScoreMR(bt.Strategy):
         a = self.datas[0]
         b = self.datas[1]
 
-        self.ratio = a.close / b.close
-        sma = bt.indicators.SMA(self.ratio, period=self.p.lookback)
-        std = bt.indicators.StdDev(self.ratio, period=self.p.lookback)
-        self.z = (self.ratio - sma) / (std + self.p.min_std)
+        # feeds are aligned on common timestamps by the runner, so bar i is the same in both
+        self._a_close = line_array(a.close)
+        self._b_close = line_array(b.close)
+        self.ratio = self._a_close / self._b_close
+        self.z = rolling_zscore(self.ratio, int(self.p.lookback), float(self.p.min_std))
 
         self.order = None
         self.entry_bar = None
         self.side = 0  # +1 long ratio, -1 short ratio
 
+        # params read per bar, bound once
+        self._z_entry = abs(float(self.p.z_entry))
+        self._z_entry_lo = -self._z_entry
+        self._z_exit = float(self.p.z_exit)
+        self._max_hold = self.p.max_bars_hold
+        self._leg_frac = float(self.p.leg_value_frac)
+
     def next(self):
         if self.order:
             return
 
+        n = len(self)
+        z = self.z[n - 1]
+
         # Exit logic
         if self.side != 0:
-            if abs(float(self.z[0])) <= float(self.p.z_exit):
+            if abs(z) <= self._z_exit:
                 self.order = self._close_pair(); return
-            if self.entry_bar is not None and (len(self) - self.entry_bar) >= self.p.max_bars_hold:
+            if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
                 self.order = self._close_pair(); return
+            return
 
-        if self.side == 0:
-            if float(self.z[0]) <= -abs(self.p.z_entry):
-                self.order = self._open_pair(+1); return
-            if float(self.z[0]) >= abs(self.p.z_entry):
-                self.order = self._open_pair(-1); return
+        if z <= self._z_entry_lo:
+            self.order = self._open_pair(+1); return
+        if z >= self._z_entry:
+            self.order = self._open_pair(-1); return
 
     def _open_pair(self, side: int):
         a = self.datas[0]
         b = self.datas[1]
 
         value = float(self.broker.getvalue())
-        leg_value = value * float(self.p.leg_value_frac)
+        leg_value = value * self._leg_frac
 
-        a_px = float(a.close[0])
-        b_px = float(b.close[0])
+        i = len(self) - 1
+        a_px = self._a_close[i]
+        b_px = self._b_close[i]
         if a_px <= 0 or b_px <= 0:
             return None
 
+        # true division (not leg_value * 1/px): a reciprocal can round across an integer
+        # and change the share count by one
         a_size = int(leg_value / a_px)
         b_size = int(leg_value / b_px)
         if a_size <= 0 or b_size <= 0:
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Iterable, List, Literal, Sequence
+from itertools import product
+from pathlib import Path
+from typing import Any, Callable, ClassVar, Dict, Iterable, Iterator, List, Literal, Sequence, Tuple
 
 import backtrader as bt
+import pandas as pd
 
+from ..backtest_runner import BacktestConfig, run_backtest_df
 from .rsi2 import RSI2Daytrade
 from .bollinger_mr import BollingerMR
 from .zscore_mr import ZScoreMR
@@ -37,123 +43,128 @@ class StrategySpec:
     # How many symbols/data feeds are required.
     n_legs: int = 1
 
+    # Default search space as ((param, values), ...), set per strategy at class level.
+    # Built once at import; tuples of primitives are also cheap to pickle to workers.
+    DEFAULT_GRID: ClassVar[Tuple[Tuple[str, Tuple[Any, ...]], ...]] = ()
+
     def default_param_grid(self) -> Dict[str, List[Any]]:
-        """Return a default search space. Can be overridden per strategy."""
-        raise NotImplementedError
+        """Return the default search space as a (fresh, editable) dict of lists."""
+        if not self.DEFAULT_GRID:
+            raise NotImplementedError
+        return {k: list(v) for k, v in self.DEFAULT_GRID}
+
+    def iter_configs(self) -> Iterator[Dict[str, Any]]:
+        """Lazily yield every params dict of the default grid (same order as expand_grid)."""
+        if not self.DEFAULT_GRID:
+            raise NotImplementedError
+        keys = [k for k, _ in self.DEFAULT_GRID]
+        for combo in product(*(v for _, v in self.DEFAULT_GRID)):
+            yield dict(zip(keys, combo))
 
 
 class _RSI2(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "rsi_period": [2, 3, 4, 5],
-            "entry_rsi": [10.0, 15.0, 20.0],
-            "stop_pct": [0.004, 0.006, 0.008],
-            "take_pct": [0.006, 0.009, 0.012],
-            "max_bars_hold": [4, 8, 12],
-        }
+    DEFAULT_GRID = (
+        ("rsi_period", (2, 3, 4, 5)),
+        ("entry_rsi", (10.0, 15.0, 20.0)),
+        ("stop_pct", (0.004, 0.006, 0.008)),
+        ("take_pct", (0.006, 0.009, 0.012)),
+        ("max_bars_hold", (4, 8, 12)),
+    )
 
 
 class _Boll(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "bb_period": [15, 20, 30],
-            "bb_dev": [1.5, 2.0, 2.5],
-            "stop_pct": [0.006, 0.008, 0.010],
-            "take_pct": [0.008, 0.010, 0.012],
-            "max_bars_hold": [12, 16, 24],
-        }
+    DEFAULT_GRID = (
+        ("bb_period", (15, 20, 30)),
+        ("bb_dev", (1.5, 2.0, 2.5)),
+        ("stop_pct", (0.006, 0.008, 0.010)),
+        ("take_pct", (0.008, 0.010, 0.012)),
+        ("max_bars_hold", (12, 16, 24)),
+    )
 
 
 class _Z(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "lookback": [30, 50, 80],
-            "z_entry": [1.5, 2.0, 2.5],
-            "z_exit": [0.0, 0.5],
-            "stop_pct": [0.008, 0.010, 0.012],
-            "take_pct": [0.010, 0.012, 0.015],
-            "max_bars_hold": [12, 24, 36],
-        }
+    DEFAULT_GRID = (
+        ("lookback", (30, 50, 80)),
+        ("z_entry", (1.5, 2.0, 2.5)),
+        ("z_exit", (0.0, 0.5)),
+        ("stop_pct", (0.008, 0.010, 0.012)),
+        ("take_pct", (0.010, 0.012, 0.015)),
+        ("max_bars_hold", (12, 24, 36)),
+    )
 
 
 class _VWAP(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "dev_entry": [0.004, 0.006, 0.008],
-            "dev_exit": [0.0, 0.002],
-            "stop_pct": [0.008, 0.010, 0.012],
-            "take_pct": [0.008, 0.010, 0.012],
-            "max_bars_hold": [8, 12, 16],
-        }
+    DEFAULT_GRID = (
+        ("dev_entry", (0.004, 0.006, 0.008)),
+        ("dev_exit", (0.0, 0.002)),
+        ("stop_pct", (0.008, 0.010, 0.012)),
+        ("take_pct", (0.008, 0.010, 0.012)),
+        ("max_bars_hold", (8, 12, 16)),
+    )
 
 
 class _Pairs(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "lookback": [30, 50, 80],
-            "z_entry": [1.5, 2.0, 2.5],
-            "z_exit": [0.25, 0.5, 0.75],
-            "max_bars_hold": [24, 48, 72],
-            "leg_value_frac": [0.35, 0.45],
-        }
+    DEFAULT_GRID = (
+        ("lookback", (30, 50, 80)),
+        ("z_entry", (1.5, 2.0, 2.5)),
+        ("z_exit", (0.25, 0.5, 0.75)),
+        ("max_bars_hold", (24, 48, 72)),
+        ("leg_value_frac", (0.35, 0.45)),
+    )
 
 
 class _MACross(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "fast": [10, 20, 30],
-            "slow": [50, 100, 150],
-            "ma_type": ["sma", "ema"],
-            "stop_pct": [0.008, 0.010, 0.012],
-            "take_pct": [0.010, 0.015, 0.020],
-            "max_bars_hold": [130, 260, 520],
-        }
+    DEFAULT_GRID = (
+        ("fast", (10, 20, 30)),
+        ("slow", (50, 100, 150)),
+        ("ma_type", ("sma", "ema")),
+        ("stop_pct", (0.008, 0.010, 0.012)),
+        ("take_pct", (0.010, 0.015, 0.020)),
+        ("max_bars_hold", (130, 260, 520)),
+    )
 
 
 class _TrendPullback(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "fast": [10, 20, 30],
-            "slow": [80, 100, 150],
-            "ma_type": ["ema"],
-            "atr_period": [14, 20],
-            "pullback_atr": [0.3, 0.5, 0.8],
-            "stop_pct": [0.008, 0.010, 0.012],
-            "take_pct": [0.012, 0.015, 0.020],
-            "max_bars_hold": [130, 260, 520],
-        }
+    DEFAULT_GRID = (
+        ("fast", (10, 20, 30)),
+        ("slow", (80, 100, 150)),
+        ("ma_type", ("ema",)),
+        ("atr_period", (14, 20)),
+        ("pullback_atr", (0.3, 0.5, 0.8)),
+        ("stop_pct", (0.008, 0.010, 0.012)),
+        ("take_pct", (0.012, 0.015, 0.020)),
+        ("max_bars_hold", (130, 260, 520)),
+    )
 
 
 class _SuperTrend(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "period": [7, 10, 14],
-            "multiplier": [2.0, 2.5, 3.0, 3.5],
-            "stop_pct": [0.008, 0.010, 0.012],
-            "take_pct": [0.012, 0.015, 0.020],
-            "max_bars_hold": [130, 260, 520],
-        }
+    DEFAULT_GRID = (
+        ("period", (7, 10, 14)),
+        ("multiplier", (2.0, 2.5, 3.0, 3.5)),
+        ("stop_pct", (0.008, 0.010, 0.012)),
+        ("take_pct", (0.012, 0.015, 0.020)),
+        ("max_bars_hold", (130, 260, 520)),
+    )
 
 
 class _STDailyRSI2(StrategySpec):
-    def default_param_grid(self):
-        return {
-            "st_period": [20],
-            "st_multiplier": [3.0],
-            "rsi_period": [2],
-            "entry_rsi": [15.0],
-            "roc_period": [4],
-            "roc_entry_th": [0.0, -0.005],
-            "stop_pct": [0.006, 0.008],
-            "max_bars_hold": [72],
-            "max_bars_hold_max": [216],
-            "enable_ma_profit_trail": [1],
-            "trail_pnl_th": [0.008, 0.012],
-            "ma_period": [5],
-            "atr_period": [14],
-            "atr_mult": [2.5, 3.5],
-            "trail_pct": [0.0], # 0 means use ATR
-        }
+    DEFAULT_GRID = (
+        ("st_period", (20,)),
+        ("st_multiplier", (3.0,)),
+        ("rsi_period", (2,)),
+        ("entry_rsi", (15.0,)),
+        ("roc_period", (4,)),
+        ("roc_entry_th", (0.0, -0.005)),
+        ("stop_pct", (0.006, 0.008)),
+        ("max_bars_hold", (72,)),
+        ("max_bars_hold_max", (216,)),
+        ("enable_ma_profit_trail", (1,)),
+        ("trail_pnl_th", (0.008, 0.012)),
+        ("ma_period", (5,)),
+        ("atr_period", (14,)),
+        ("atr_mult", (2.5, 3.5)),
+        ("trail_pct", (0.0,)), # 0 means use ATR
+    )
 
 
 SPECS: Dict[str, StrategySpec] = {
@@ -173,3 +184,85 @@ def get_strategy_spec(strategy_id: str) -> StrategySpec:
     if strategy_id not in SPECS:
         raise KeyError(f"Unknown strategy_id={strategy_id}. Available: {sorted(SPECS.keys())}")
     return SPECS[strategy_id]
+
+
+def expand_grid(space: Dict[str, Sequence[Any]]) -> List[Dict[str, Any]]:
+    """Cartesian product of a param space, in key order (last key varies fastest)."""
+    keys = list(space.keys())
+    return [dict(zip(keys, combo)) for combo in product(*(space[k] for k in keys))]
+
+
+# Worker-process copy of the bars for run_grid. Set once per worker by the pool
+# initializer, so the frames are pickled once per process rather than per candidate.
+_GRID_DFS: List[pd.DataFrame] | None = None
+
+
+def _grid_init(dfs_utc: List[pd.DataFrame]) -> None:
+    global _GRID_DFS
+    _GRID_DFS = dfs_utc
+
+
+def _grid_run_one(strategy_id: str, params: Dict[str, Any], out_dir: Path, cfg: BacktestConfig, meta: Dict[str, Any] | None) -> dict:
+    spec = get_strategy_spec(strategy_id)
+    return run_backtest_df(
+        _GRID_DFS, out_dir=out_dir, cfg=cfg, strategy_cls=spec.cls, strat_params=params,
+        snapshot_meta=meta, persist_details=False, strategy_id=spec.id,
+    )
+
+
+def run_grid(
+    strategy_id: str,
+    dfs_utc: List[pd.DataFrame],
+    cfg: BacktestConfig,
+    out_root: Path,
+    grid: Dict[str, Sequence[Any]] | List[Dict[str, Any]] | None = None,
+    snapshot_meta: Dict[str, Any] | None = None,
+    max_workers: int | None = None,
+    progress: Callable[[int, int], None] | None = None,
+) -> List[Tuple[Dict[str, Any], dict]]:
+    """Backtest every candidate of a param grid, one process per worker.
+
+    - grid: a param space (dict of lists, expanded with expand_grid), an explicit list of
+      params dicts, or None for the strategy's default_param_grid().
+    - Candidate j writes its summary.json to out_root/cand_{j:04d} (summary only) with
+      snapshot_meta plus {"cand": j}.
+    - max_workers defaults to os.cpu_count(); 1 runs in-process.
+    - progress(done, total) is called as candidates finish (in completion order).
+
+    Returns [(params, summary)] in candidate order, so callers that pick the first best
+    score get the same answer as a serial loop.
+    """
+    spec = get_strategy_spec(strategy_id)
+    if grid is None:
+        candidates = list(spec.iter_configs())
+    else:
+        candidates = expand_grid(grid) if isinstance(grid, dict) else list(grid)
+
+    def _meta(j: int) -> Dict[str, Any] | None:
+        if snapshot_meta is None:
+            return None
+        m = dict(snapshot_meta)
+        m["cand"] = j
+        return m
+
+    n = len(candidates)
+    summaries: List[dict | None] = [None] * n
+    workers = min(max_workers or os.cpu_count() or 1, max(n, 1))
+    if workers <= 1:
+        _grid_init(dfs_utc)
+        for j, p in enumerate(candidates):
+            summaries[j] = _grid_run_one(spec.id, p, out_root / f"cand_{j:04d}", cfg, _meta(j))
+            if progress is not None:
+                progress(j + 1, n)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_grid_init, initargs=(dfs_utc,)) as ex:
+            futs = {
+                ex.submit(_grid_run_one, spec.id, p, out_root / f"cand_{j:04d}", cfg, _meta(j)): j
+                for j, p in enumerate(candidates)
+            }
+            for done, fut in enumerate(as_completed(futs), 1):
+                summaries[futs[fut]] = fut.result()
+                if progress is not None:
+                    progress(done, n)
+
+    return list(zip(candidates, summaries))
@@ -3,6 +3,7 @@ from __future__ import annotations
 import backtrader as bt
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import line_array, wilder_rsi
 
 
 class RSI2Daytrade(LongBracketMixin, bt.Strategy):
@@ -15,23 +16,27 @@ class RSI2Daytrade(LongBracketMixin, bt.Strategy):
     )
 
     def __init__(self):
-        self.rsi = bt.indicators.RSI(self.data.close, period=self.p.rsi_period, safediv=True)
+        self.rsi = wilder_rsi(line_array(self.data.close), int(self.p.rsi_period), safediv=True)
         self._reset_orders()
         self.entry_bar = None
         self.entry_price = None
 
+        # params read per bar, bound once (self.p.X goes through backtrader's param lookup)
+        self._entry_rsi = float(self.p.entry_rsi)
+        self._max_hold = self.p.max_bars_hold
+
     def next(self):
         # if any pending order exists, wait
         if self.order_entry or self.order_stop or self.order_take:
             return
 
         if not self.position:
-            if self.rsi[0] < self.p.entry_rsi:
+            if self.rsi[len(self) - 1] < self._entry_rsi:
                 self.order_entry = self.buy()
             return
 
         # Time stop / max hold
         if self.entry_bar is not None:
-            if (len(self) - self.entry_bar) >= self.p.max_bars_hold:
+            if (len(self) - self.entry_bar) >= self._max_hold:
                 self._cancel_children()
                 self.order_entry = self.close()
@@ -1,11 +1,35 @@
 from __future__ import annotations
 
-import math
-
 import backtrader as bt
+import numpy as np
 
+from .._jit import njit
 from ._bracket_mixin import LongBracketMixin
-from .supertrend import SuperTrendIndicator
+from ._kernels import atr, line_array, ohlcv, roc, sma, supertrend, wilder_rsi
+
+# per-tick gate codes (see _gate_codes)
+_WARMUP, _REGIME_DOWN, _REGIME_UP, _ENTRY = 0, 1, 2, 3
+
+
+@njit(cache=True)
+def _gate_codes(i0, nd, ddir, rsi0, roc0, entry_rsi, roc_th, min0, min1):
+    """Position-independent part of next(), one code per strategy tick.
+
+    i0[k] is the data0 bar and nd[k] the number of daily bars seen at tick k. The regime
+    is the daily dir[-1]; a flip down always lands on dir < 0, so "not up" covers it.
+    """
+    out = np.zeros(len(i0), dtype=np.int8)
+    for k in range(len(i0)):
+        i = i0[k]
+        if i + 1 < min0 or nd[k] < min1:
+            continue
+        if not ddir[nd[k] - 2] > 0:
+            out[k] = _REGIME_DOWN
+        elif rsi0[i] <= entry_rsi and roc0[i] <= roc_th:
+            out[k] = _ENTRY
+        else:
+            out[k] = _REGIME_UP
+    return out
 
 
 class SuperTrendDailyRSI2(LongBracketMixin, bt.Strategy):
@@ -61,17 +85,54 @@ class SuperTrendDailyRSI2(LongBracketMixin, bt.Strategy):
         self.data0 = self.datas[0]
         self.data1 = self.datas[1]  # daily
 
-        self.rsi = bt.indicators.RSI(self.data0.close, period=self.p.rsi_period)
-        self.sma = bt.indicators.SMA(self.data0.close, period=int(self.p.ma_period))
-        self.st_d = SuperTrendIndicator(self.data1, period=self.p.st_period, multiplier=self.p.st_multiplier)
-        self.roc = bt.indicators.ROC(self.data0.close, period=int(self.p.roc_period))
-        self.atr = bt.indicators.ATR(self.data0, period=int(self.p.atr_period))
+        bars0 = ohlcv(self.data0)
+        bars1 = ohlcv(self.data1)
+        close0, high0, low0 = bars0.close, bars0.high, bars0.low
+        self._rsi_arr = wilder_rsi(close0, int(self.p.rsi_period))
+        self._sma_arr = sma(close0, int(self.p.ma_period))
+        self._roc_arr = roc(close0, int(self.p.roc_period))
+        self._atr_arr = atr(high0, low0, close0, int(self.p.atr_period))
+        _, self._dir_arr, _, _ = supertrend(
+            bars1.high, bars1.low, bars1.close, int(self.p.st_period), float(self.p.st_multiplier)
+        )
 
         self._profit_trail_active = False
         self._highest_high = 0.0
         self._trail_stop_price = 0.0
         self._trail_start_bar = -1
 
+        # params read per bar, bound once (self.p.X goes through backtrader's param lookup)
+        self._max_hold = int(self.p.max_bars_hold)
+        self._max_hold_max = int(self.p.max_bars_hold_max)
+        self._entry_rsi = float(self.p.entry_rsi)
+        self._roc_entry_th = float(self.p.roc_entry_th)
+        self._ma_profit_trail = bool(self.p.enable_ma_profit_trail)
+        self._trail_pnl_th = float(self.p.trail_pnl_th)
+        self._atr_mult = float(self.p.atr_mult)
+        self._trail_pct = float(self.p.trail_pct)
+        self._stop_pct = float(self.p.stop_pct)
+
+        # The strategy ticks on the union of both feeds' timestamps (the daily bars are
+        # stamped at midnight, when there is no intraday bar), so len(self) - 1 indexes
+        # that timeline. _gate holds everything in next() that doesn't depend on the
+        # position; minperiods are those of the bt indicators these arrays replace.
+        t0 = line_array(self.data0.datetime)
+        t1 = line_array(self.data1.datetime)
+        ticks = np.union1d(t0, t1)
+        self._gate = _gate_codes(
+            np.searchsorted(t0, ticks, side="right") - 1,
+            np.searchsorted(t1, ticks, side="right"),
+            self._dir_arr, self._rsi_arr, self._roc_arr,
+            self._entry_rsi, self._roc_entry_th,
+            max(int(self.p.rsi_period) + 1, int(self.p.ma_period), int(self.p.roc_period) + 1,
+                int(self.p.atr_period) + 1),
+            int(self.p.st_period) + 1,
+        )
+        # data0 values are indexed by len(self.data0) - 1 (daily-only ticks repeat the last bar)
+        self._c0_arr = close0
+        self._h0_arr = high0
+        self._l0_arr = low0
+
     def notify_order(self, order):
         super().notify_order(order)
         if order.status == order.Completed and order.issell():
@@ -85,33 +146,29 @@ class SuperTrendDailyRSI2(LongBracketMixin, bt.Strategy):
             return
 
         # --- 1. REGIME GUARD (NO LOOKAHEAD: USE dir[-1]) ---
-        # Backtrader: self.st_d.dir[-1] is the value from the PREVIOUS daily bar.
-        if len(self.st_d.dir) < 2:
+        # The daily dir of the PREVIOUS daily bar, resolved per tick in _gate_codes.
+        n = len(self)
+        gate = self._gate[n - 1]
+        if gate == _WARMUP:
             return
-        
-        ddir = float(self.st_d.dir[-1])
-        daily_up = ddir > 0
-        
-        # Trend Flip Logic (Yesterday was UP, now Yesterday is DOWN)
-        # Note: In backtrader next(), [-1] always refers to the previous point in time.
-        prev_ddir = float(self.st_d.dir[-2]) if len(self.st_d.dir) >= 3 else ddir
-        flipped_down = (prev_ddir > 0) and (ddir < 0)
-
-        if self.position and (flipped_down or (not daily_up)):
+
+        if self.position and gate == _REGIME_DOWN:
             self._cancel_children()
             self.order_entry = self.close()
             try: self.order_entry.addinfo(exit_reason="regime_flip_down")
             except: pass
             return
 
+        i = len(self.data0) - 1
+
         # --- 2. TWO-STAGE TIME STOP ---
         if self.entry_bar is not None:
-            hold_bars = len(self) - self.entry_bar
-            c0 = float(self.data0.close[0])
+            hold_bars = n - self.entry_bar
+            c0 = self._c0_arr[i]
             pnl = (c0 / self.entry_price) - 1.0 if self.entry_price else 0.0
 
             # Cut losers fast
-            if hold_bars >= int(self.p.max_bars_hold) and pnl <= 0:
+            if hold_bars >= self._max_hold and pnl <= 0:
                 self._cancel_children()
                 self.order_entry = self.close()
                 try: self.order_entry.addinfo(exit_reason="time_stop_loss")
@@ -119,7 +176,7 @@ class SuperTrendDailyRSI2(LongBracketMixin, bt.Strategy):
                 return
 
             # Hard max time
-            if hold_bars >= int(self.p.max_bars_hold_max):
+            if hold_bars >= self._max_hold_max:
                 self._cancel_children()
                 self.order_entry = self.close()
                 try: self.order_entry.addinfo(exit_reason="time_stop_max")
@@ -128,58 +185,50 @@ class SuperTrendDailyRSI2(LongBracketMixin, bt.Strategy):
 
         # --- 3. ENTRIES (WITH ROC FILTER) ---
         if not self.position:
-            if not daily_up:
-                return
-            
-            rsi0 = float(self.rsi[0])
-            roc0 = float(self.roc[0])
-            if math.isnan(rsi0) or math.isnan(roc0):
-                return
-
-            if rsi0 <= float(self.p.entry_rsi) and roc0 <= float(self.p.roc_entry_th):
+            if gate == _ENTRY:
                 self.order_entry = self.buy()
             return
 
         # --- 4. PROFIT TRAIL ACTIVATION ---
-        if bool(self.p.enable_ma_profit_trail) and (not self._profit_trail_active):
-            c0 = float(self.data0.close[0])
-            sma0 = float(self.sma[0])
+        if self._ma_profit_trail and (not self._profit_trail_active):
+            c0 = self._c0_arr[i]
+            sma0 = self._sma_arr[i]
             pnl = (c0 / self.entry_price) - 1.0 if self.entry_price else 0.0
 
-            if c0 > sma0 and pnl >= float(self.p.trail_pnl_th):
+            if c0 > sma0 and pnl >= self._trail_pnl_th:
                 self._profit_trail_active = True
-                self._trail_start_bar = len(self)
-                self._highest_high = float(self.data0.high[0])
+                self._trail_start_bar = n
+                self._highest_high = self._h0_arr[i]
                 
                 # Initial Trail Price calculation (ATR vs % Fixed)
                 h0 = self._highest_high
-                if float(self.p.atr_mult) > 0:
-                    dist = float(self.p.atr_mult) * float(self.atr[0])
+                if self._atr_mult > 0:
+                    dist = self._atr_mult * self._atr_arr[i]
                     self._trail_stop_price = h0 - dist
                 else:
-                    self._trail_stop_price = h0 * (1.0 - float(self.p.trail_pct))
+                    self._trail_stop_price = h0 * (1.0 - self._trail_pct)
                 
                 # Safety: Trail stop cannot be worse than the current fixed catastrophic stop
                 # (Entry * (1-stop_pct))
-                hard_stop = self.entry_price * (1.0 - float(self.p.stop_pct))
+                hard_stop = self.entry_price * (1.0 - self._stop_pct)
                 self._trail_stop_price = max(self._trail_stop_price, hard_stop)
 
         # --- 5. MANUAL TRAILING STOP (HIGH PRECISION) ---
         if self._profit_trail_active:
-            h0 = float(self.data0.high[0])
+            h0 = self._h0_arr[i]
             if h0 > self._highest_high:
                 self._highest_high = h0
-                if float(self.p.atr_mult) > 0:
-                    dist = float(self.p.atr_mult) * float(self.atr[0])
+                if self._atr_mult > 0:
+                    dist = self._atr_mult * self._atr_arr[i]
                     new_stop = h0 - dist
                 else:
-                    new_stop = h0 * (1.0 - float(self.p.trail_pct))
+                    new_stop = h0 * (1.0 - self._trail_pct)
                 
                 # Stop price only goes UP
                 self._trail_stop_price = max(self._trail_stop_price, new_stop)
             
-            l0 = float(self.data0.low[0])
-            if len(self) > self._trail_start_bar and l0 <= self._trail_stop_price:
+            l0 = self._l0_arr[i]
+            if n > self._trail_start_bar and l0 <= self._trail_stop_price:
                 self._cancel_children()
                 self.order_entry = self.close()
                 try: self.order_entry.addinfo(exit_reason="profit_trail")
@@ -5,6 +5,10 @@ import math
 import backtrader as bt
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import _supertrend_kernel, atr, line_view, ohlcv
+
+# next() tests NaN as x != x (one float compare, no call)
+_NAN = math.nan
 
 
 class SuperTrendIndicator(bt.Indicator):
@@ -15,8 +19,10 @@ class SuperTrendIndicator(bt.Indicator):
     - dir: +1 uptrend, -1 downtrend
 
     Implementation notes:
-    - Uses ATR and basic bands.
+    - Uses ATR and basic bands, computed as arrays over the preloaded feed.
     - Uses iterative final band logic.
+    - With runonce (the default) once() runs the band recurrence over the whole feed in
+      one kernel call; next() is the runonce=False path.
     """
 
     lines = ("st", "dir", "upper", "lower")
@@ -29,79 +35,98 @@ class SuperTrendIndicator(bt.Indicator):
     plotinfo = dict(subplot=False)
 
     def __init__(self):
-        self.atr = bt.indicators.ATR(self.data, period=self.p.period)
-        hl2 = (self.data.high + self.data.low) / 2.0
-        self.basic_upper = hl2 + self.p.multiplier * self.atr
-        self.basic_lower = hl2 - self.p.multiplier * self.atr
+        # ATR and basic bands over the whole (preloaded) feed, instead of bt ATR + line ops
+        bars = ohlcv(self.data)
+        self._close = bars.close
+        self._atr = atr(bars.high, bars.low, bars.close, int(self.p.period))
+        hl2 = (bars.high + bars.low) / 2.0
+        self._bu = hl2 + self.p.multiplier * self._atr
+        self._bl = hl2 - self.p.multiplier * self._atr
+        # minperiod of the bt ATR this replaces
+        self.addminperiod(int(self.p.period) + 1)
+        # next() reads/writes the lines' array('d') buffers directly (index i == bar i,
+        # backtrader's default unbounded buffers) instead of going through line[0]/[-1]
+        lines = self.lines
+        self._bufs = (lines.upper.array, lines.lower.array, lines.dir.array, lines.st.array)
+
+    def once(self, start, end):
+        # the kernel is next() below and writes straight into the line buffers, which
+        # forward() has NaN-filled
+        _supertrend_kernel(
+            self._close[:end],
+            self._bu,
+            self._bl,
+            start,
+            line_view(self.lines.st),
+            line_view(self.lines.dir),
+            line_view(self.lines.upper),
+            line_view(self.lines.lower),
+        )
 
     def next(self):
         i = len(self) - 1
+        upper, lower, dir_buf, st = self._bufs
 
         # If ATR (or derived bands) are not ready, emit NaNs to avoid contaminating state.
-        atr0 = float(self.atr[0]) if self.atr[0] is not None else float('nan')
-        bu0 = float(self.basic_upper[0]) if self.basic_upper[0] is not None else float('nan')
-        bl0 = float(self.basic_lower[0]) if self.basic_lower[0] is not None else float('nan')
-        if math.isnan(atr0) or math.isnan(bu0) or math.isnan(bl0):
-            self.lines.upper[0] = float('nan')
-            self.lines.lower[0] = float('nan')
-            self.lines.st[0] = float('nan')
+        atr0 = self._atr[i]
+        bu = self._bu[i]
+        bl = self._bl[i]
+        if atr0 != atr0 or bu != bu or bl != bl:
+            upper[i] = _NAN
+            lower[i] = _NAN
+            st[i] = _NAN
             # keep previous dir if exists; else NaN
-            if i > 0:
-                self.lines.dir[0] = self.lines.dir[-1]
-            else:
-                self.lines.dir[0] = float('nan')
+            dir_buf[i] = dir_buf[i - 1] if i > 0 else _NAN
             return
 
         # Initialize when we have our first *valid* bands.
         # NOTE: backtrader will call next() throughout warmup, so i may be > 0 even
         # when prior values were NaN. If prev_dir is NaN and we carry it forward, the
         # whole state machine can get stuck at NaN forever (=> zero trades).
-        if i == 0 or math.isnan(float(self.lines.dir[-1])):
-            self.lines.upper[0] = bu0
-            self.lines.lower[0] = bl0
+        prev_dir = dir_buf[i - 1] if i > 0 else _NAN
+        if prev_dir != prev_dir:
+            upper[i] = bu
+            lower[i] = bl
             # Common SuperTrend convention: start in uptrend so ST begins at lower band.
             # (Starting from upper band makes flips extremely rare and is not what we want.)
-            self.lines.dir[0] = 1.0
-            self.lines.st[0] = bl0
+            dir_buf[i] = 1.0
+            st[i] = bl
             return
 
-        prev_upper = float(self.lines.upper[-1])
-        prev_lower = float(self.lines.lower[-1])
-        prev_dir = float(self.lines.dir[-1])
-        prev_close = float(self.data.close[-1])
+        prev_upper = upper[i - 1]
+        prev_lower = lower[i - 1]
+        prev_close = self._close[i - 1]
 
         # final upper
-        bu = float(self.basic_upper[0])
-        if (not math.isnan(prev_upper)) and (bu < prev_upper or prev_close > prev_upper):
+        if (prev_upper == prev_upper) and (bu < prev_upper or prev_close > prev_upper):
             fu = bu
-        elif math.isnan(prev_upper):
+        elif prev_upper != prev_upper:
             fu = bu
         else:
             fu = prev_upper
 
         # final lower
-        bl = float(self.basic_lower[0])
-        if (not math.isnan(prev_lower)) and (bl > prev_lower or prev_close < prev_lower):
+        if (prev_lower == prev_lower) and (bl > prev_lower or prev_close < prev_lower):
             fl = bl
-        elif math.isnan(prev_lower):
+        elif prev_lower != prev_lower:
             fl = bl
         else:
             fl = prev_lower
 
-        self.lines.upper[0] = fu
-        self.lines.lower[0] = fl
+        upper[i] = fu
+        lower[i] = fl
 
         # direction switch
         # Use CURRENT final bands for the flip condition.
-        close = self.data.close[0]
+        close = self._close[i]
         dir_ = prev_dir
         if prev_dir > 0 and close < fl:
             dir_ = -1.0
         elif prev_dir < 0 and close > fu:
             dir_ = 1.0
 
-        self.lines.dir[0] = dir_
-        self.lines.st[0] = fl if dir_ > 0 else fu
+        dir_buf[i] = dir_
+        st[i] = fl if dir_ > 0 else fu
 
 
 class SuperTrend(LongBracketMixin, bt.Strategy):
@@ -146,10 +171,16 @@ class SuperTrend(LongBracketMixin, bt.Strategy):
         self.last_exit_bar = None
 
         self.st = SuperTrendIndicator(self.data, period=self.p.period, multiplier=self.p.multiplier)
+        self._close = ohlcv(self.data).close
 
         # cross of direction: from -1 to +1 => entry, +1 to -1 => exit
         self._prev_dir = None
 
+        # params read per bar, bound once (self.p.X goes through backtrader's param lookup)
+        self._enter_on_start = bool(self.p.enter_on_start)
+        self._allow_reentry = bool(self.p.allow_reentry)
+        self._max_hold = int(self.p.max_bars_hold)
+
     def notify_order(self, order):
         # Let LongBracketMixin manage bracket children + entry/exit bookkeeping.
         super().notify_order(order)
@@ -166,21 +197,23 @@ class SuperTrend(LongBracketMixin, bt.Strategy):
             return
 
         # Warmup guard: indicator must be valid
-        dir_val = float(self.st.dir[0]) if self.st.dir[0] is not None else float('nan')
-        st_line = float(self.st.st[0]) if self.st.st[0] is not None else float('nan')
-        if math.isnan(dir_val) or math.isnan(st_line):
+        # (backtrader lines hold NaN, never None, for missing values)
+        dir_ = self.st.dir[0]
+        st_line = self.st.st[0]
+        if dir_ != dir_ or st_line != st_line:
             return
 
-        dir_ = dir_val
         prev = self._prev_dir
         self._prev_dir = dir_
 
-        close0 = float(self.data.close[0])
+        n = len(self)
+        i = n - 1
+        close0 = self._close[i]
 
         # Previous bar values (guard for first bar)
-        if len(self) >= 2:
-            st_prev = float(self.st.st[-1])
-            close_prev = float(self.data.close[-1])
+        if i >= 1:
+            st_prev = self.st.st[-1]
+            close_prev = self._close[i - 1]
         else:
             st_prev, close_prev = st_line, close0
 
@@ -190,7 +223,7 @@ class SuperTrend(LongBracketMixin, bt.Strategy):
         # --- entries ---
         if not self.position:
             # (1) Start-of-series entry: if first valid regime is uptrend, enter once.
-            if bool(self.p.enter_on_start) and prev is None and dir_ > 0:
+            if self._enter_on_start and prev is None and dir_ > 0:
                 self.order_entry = self.buy()
                 return
 
@@ -201,17 +234,17 @@ class SuperTrend(LongBracketMixin, bt.Strategy):
 
             # (3) Optional re-entry: if we're in uptrend but got stopped/took profit, re-enter
             # when price reclaims the supertrend line (cross up).
-            if bool(self.p.allow_reentry) and dir_ > 0:
+            if self._allow_reentry and dir_ > 0:
                 # Re-entry policy:
                 # - If we *just* exited via bracket while still in an uptrend, re-enter immediately
                 #   (otherwise with wide ST bands you can get "one month of trades then nothing").
                 # - Otherwise, require a cross back above the ST line.
-                just_exited = (self.last_exit_bar is not None) and ((len(self) - self.last_exit_bar) <= 1)
+                just_exited = (self.last_exit_bar is not None) and ((n - self.last_exit_bar) <= 1)
                 if just_exited and close0 > st_line:
                     self.order_entry = self.buy()
                     return
 
-                if not math.isnan(st_prev):
+                if st_prev == st_prev:
                     cross_up = (close_prev <= st_prev) and (close0 > st_line)
                     if cross_up:
                         self.order_entry = self.buy()
@@ -231,7 +264,7 @@ class SuperTrend(LongBracketMixin, bt.Strategy):
             return
 
         # Time stop
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= int(self.p.max_bars_hold):
+        if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close()
             return
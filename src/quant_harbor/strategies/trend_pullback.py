@@ -3,6 +3,10 @@ from __future__ import annotations
 import backtrader as bt
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import ohlcv
+
+# ma_type -> indicator; anything else is EMA
+_MA_TYPES = {"sma": bt.indicators.SMA, "ema": bt.indicators.EMA}
 
 
 class TrendPullback(LongBracketMixin, bt.Strategy):
@@ -40,24 +44,26 @@ class TrendPullback(LongBracketMixin, bt.Strategy):
         self.entry_bar = None
         self.entry_price = None
 
-        ma_type = str(self.p.ma_type).lower()
-        if ma_type == "sma":
-            self.fast_ma = bt.indicators.SMA(self.data.close, period=self.p.fast)
-            self.slow_ma = bt.indicators.SMA(self.data.close, period=self.p.slow)
-        else:
-            self.fast_ma = bt.indicators.EMA(self.data.close, period=self.p.fast)
-            self.slow_ma = bt.indicators.EMA(self.data.close, period=self.p.slow)
+        ma = _MA_TYPES.get(str(self.p.ma_type).lower(), bt.indicators.EMA)
+        self.fast_ma = ma(self.data.close, period=self.p.fast)
+        self.slow_ma = ma(self.data.close, period=self.p.slow)
 
         self.atr = bt.indicators.ATR(self.data, period=self.p.atr_period)
+        self._close = ohlcv(self.data).close
 
         # state: were we in a pullback (below fast MA) while trend ok?
         self._pullback_armed = False
 
+        # params read per bar, bound once (self.p.X goes through backtrader's param lookup)
+        self._pullback_atr = float(self.p.pullback_atr)
+        self._max_hold = int(self.p.max_bars_hold)
+
     def next(self):
         if self.order_entry or self.order_stop or self.order_take:
             return
 
-        trend_ok = self.fast_ma[0] > self.slow_ma[0]
+        fast0 = self.fast_ma[0]
+        trend_ok = fast0 > self.slow_ma[0]
 
         if not self.position:
             if not trend_ok:
@@ -65,13 +71,14 @@ class TrendPullback(LongBracketMixin, bt.Strategy):
                 return
 
             # arm when we dip sufficiently below fast_ma
-            pb_level = self.fast_ma[0] - float(self.p.pullback_atr) * self.atr[0]
-            if self.data.close[0] < pb_level:
+            pb_level = fast0 - self._pullback_atr * self.atr[0]
+            c0 = self._close[len(self) - 1]
+            if c0 < pb_level:
                 self._pullback_armed = True
                 return
 
             # trigger when pullback armed and we recover above fast_ma
-            if self._pullback_armed and self.data.close[0] > self.fast_ma[0]:
+            if self._pullback_armed and c0 > fast0:
                 self._pullback_armed = False
                 self.order_entry = self.buy()
             return
@@ -82,7 +89,7 @@ class TrendPullback(LongBracketMixin, bt.Strategy):
             self.order_entry = self.close()
             return
 
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= int(self.p.max_bars_hold):
+        if self.entry_bar is not None and (len(self) - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close()
             return
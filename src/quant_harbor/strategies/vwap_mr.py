@@ -1,8 +1,10 @@
 from __future__ import annotations
 
 import backtrader as bt
+import numpy as np
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import line_array, line_view, ohlcv, session_vwap
 
 
 class IntradayVWAP(bt.Indicator):
@@ -12,27 +14,20 @@ class IntradayVWAP(bt.Indicator):
 
     def __init__(self):
         self.addminperiod(1)
-        self._cum_pv = 0.0
-        self._cum_v = 0.0
-        self._last_date = None
-
-    def next(self):
-        d = self.data.datetime.date(0)
-        if self._last_date is None or d != self._last_date:
-            self._cum_pv = 0.0
-            self._cum_v = 0.0
-            self._last_date = d
-
-        px = float(self.data.close[0])
-        v = float(getattr(self.data, "volume")[0]) if hasattr(self.data, "volume") else 0.0
+        # whole feed at once (preloaded); sessions use the datetime line's tz like date(0)
+        close = line_array(self.data.close)
+        if hasattr(self.data, "volume"):
+            volume = line_array(self.data.volume)
+        else:
+            volume = np.zeros(len(close))
+        dt = self.data.datetime
+        self._vwap = session_vwap(close, volume, line_array(dt), dt._tz)
 
-        self._cum_pv += px * v
-        self._cum_v += v
+    def once(self, start, end):
+        line_view(self.lines.vwap)[start:end] = self._vwap[start:end]
 
-        if self._cum_v > 0:
-            self.lines.vwap[0] = self._cum_pv / self._cum_v
-        else:
-            self.lines.vwap[0] = px
+    def next(self):
+        self.lines.vwap[0] = self._vwap[len(self) - 1]
 
 
 class VWAPDeviationMR(LongBracketMixin, bt.Strategy):
@@ -70,26 +65,38 @@ class VWAPDeviationMR(LongBracketMixin, bt.Strategy):
         self.entry_bar = None
         self.entry_price = None
 
+        # params read per bar, bound once (self.p.X goes through backtrader's param lookup)
+        self._max_hold = self.p.max_bars_hold
+
+        # next() only needs these per-bar signals, so they are computed up front
+        vwap = self.vwap._vwap
+        close = ohlcv(self.data).close
+        self._no_vwap = vwap <= 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dev = (close - vwap) / vwap
+        self._enter = dev <= -abs(self.p.dev_entry)
+        self._exit = dev >= -abs(self.p.dev_exit)
+
     def next(self):
         if self.order_entry or self.order_stop or self.order_take:
             return
 
-        vwap = float(self.vwap.vwap[0])
-        if vwap <= 0:
+        n = len(self)
+        i = n - 1
+        if self._no_vwap[i]:
             return
-        dev = (float(self.data.close[0]) - vwap) / vwap
 
         if not self.position:
-            if dev <= -abs(self.p.dev_entry):
+            if self._enter[i]:
                 self.order_entry = self.buy()
             return
 
-        if dev >= -abs(self.p.dev_exit):
+        if self._exit[i]:
             self._cancel_children()
             self.order_entry = self.close();
             return
 
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= self.p.max_bars_hold:
+        if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close();
             return
@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import backtrader as bt
+import numpy as np
+import pandas as pd
 
 from ._bracket_mixin import LongBracketMixin
+from ._kernels import line_array, rolling_zscore
+from ._sweep import simulate_long
 
 
 class ZScoreMR(LongBracketMixin, bt.Strategy):
@@ -32,32 +36,76 @@ class ZScoreMR(LongBracketMixin, bt.Strategy):
         trail_pct=0.0,
     )
 
+    @classmethod
+    def vectorized_signals(cls, close: np.ndarray, **params) -> tuple[np.ndarray, np.ndarray]:
+        """next()'s two z tests over a whole close array: (z <= -|z_entry|, z >= -|z_exit|).
+
+        params override the class defaults. Warmup bars (NaN z) are False in both masks.
+        """
+        p = cls._with_defaults(params)
+        z = rolling_zscore(np.asarray(close, dtype=np.float64), int(p["lookback"]), float(p["min_std"]))
+        return z <= -abs(p["z_entry"]), z >= -abs(p["z_exit"])
+
+    @classmethod
+    def run_vectorized(
+        cls, bars: pd.DataFrame, slippage_bps_side: float = 0.0, brackets: bool = False, **params
+    ) -> pd.DataFrame:
+        """This strategy's trades on an OHLC frame without Cerebro (_sweep.simulate_long).
+
+        Per unit notional (no sizer, cash or commission). brackets=False reproduces
+        backtest_runner, where the stop/take children are never placed; brackets=True
+        models fixed stop/take children (not the trailing stop).
+        """
+        p = cls._with_defaults(params)
+        if brackets and (p["use_trailing_stop"] or p["trail_pct"] > 0):
+            raise ValueError("run_vectorized does not model the trailing stop")
+        enter, exit_ = cls.vectorized_signals(bars["close"].to_numpy(), **params)
+        return simulate_long(
+            bars, enter, exit_,
+            max_bars_hold=int(p["max_bars_hold"]),
+            stop_pct=float(p["stop_pct"]),
+            take_pct=0.0 if p["disable_take_profit"] else float(p["take_pct"]),
+            slippage_bps_side=slippage_bps_side,
+            brackets=brackets,
+        )
+
+    @classmethod
+    def _with_defaults(cls, params: dict) -> dict:
+        p = dict(cls.params._getitems())
+        unknown = set(params) - set(p)
+        if unknown:
+            raise TypeError(f"unknown {cls.__name__} params: {sorted(unknown)}")
+        p.update(params)
+        return p
+
     def __init__(self):
-        sma = bt.indicators.SMA(self.data.close, period=self.p.lookback)
-        std = bt.indicators.StdDev(self.data.close, period=self.p.lookback)
-        self.z = (self.data.close - sma) / (std + self.p.min_std)
+        self._enter, self._exit = self.vectorized_signals(line_array(self.data.close), **self.p._getkwargs())
 
         self._reset_orders()
         self.entry_bar = None
         self.entry_price = None
 
+        # params read per bar, bound once
+        self._max_hold = self.p.max_bars_hold
+
     def next(self):
         if self.order_entry or self.order_stop or self.order_take:
             return
 
+        n = len(self)
         if not self.position:
-            if self.z[0] <= -abs(self.p.z_entry):
+            if self._enter[n - 1]:
                 self.order_entry = self.buy()
             return
 
         # Mean reversion exit
-        if self.z[0] >= -abs(self.p.z_exit):
+        if self._exit[n - 1]:
             self._cancel_children()
             self.order_entry = self.close();
             return
 
         # Time stop
-        if self.entry_bar is not None and (len(self) - self.entry_bar) >= self.p.max_bars_hold:
+        if self.entry_bar is not None and (n - self.entry_bar) >= self._max_hold:
             self._cancel_children()
             self.order_entry = self.close();
             return
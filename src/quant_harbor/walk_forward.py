@@ -1,26 +1,37 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Dict, Any, Callable, Tuple
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Callable, NamedTuple, Tuple
 
 import pandas as pd
 
 
-@dataclass
-class WfaWindow:
+# A NamedTuple: windows are bounds, never edited, and hashable as cache keys; no per-instance
+# __dict__ (dataclass slots=True would need Python 3.10), and WfaWindow(*row) builds one
+# straight from a wfa_windows_frame row.
+class WfaWindow(NamedTuple):
     train_start: pd.Timestamp
     train_end: pd.Timestamp
     oos_start: pd.Timestamp
     oos_end: pd.Timestamp
+    # Row bounds of the train/OOS spans in the index the windows were built from
+    # (frame.iloc[train_lo:train_hi] == the train rows of that frame). Required: a zero
+    # default would slice a hand-built window to nothing without any error.
+    train_lo: int
+    train_hi: int
+    oos_lo: int
+    oos_hi: int
 
 
-def make_quarterly_wfa_windows(index_utc: pd.DatetimeIndex, train_months: int = 12, oos_months: int = 3) -> List[WfaWindow]:
-    """Create rolling walk-forward windows inside a given time span.
+def wfa_windows_frame(index_utc: pd.DatetimeIndex, train_months: int = 12, oos_months: int = 3) -> pd.DataFrame:
+    """make_quarterly_wfa_windows as one DataFrame, a row per window.
 
-    - Each step advances by oos_months.
-    - train window length fixed.
+    Columns are the WfaWindow fields: train_start/train_end/oos_start/oos_end (UTC
+    datetimes) and train_lo/train_hi/oos_lo/oos_hi (row bounds of each span in
+    index_utc), for vector ops over all windows at once (durations, filters, ...).
 
-    Index must be tz-aware UTC.
+    Index must be tz-aware UTC and sorted.
     """
     if index_utc.tz is None:
         raise ValueError('index must be tz-aware UTC')
@@ -28,26 +39,82 @@ def make_quarterly_wfa_windows(index_utc: pd.DatetimeIndex, train_months: int =
     start = index_utc.min()
     end = index_utc.max()
 
-    windows: List[WfaWindow] = []
+    train_off = pd.DateOffset(months=train_months)
+    oos_off = pd.DateOffset(months=oos_months)
+    one_sec = pd.Timedelta(seconds=1)
+
+    # All OOS starts in one date_range (it steps by repeated offset application, like
+    # adding oos_off in a loop); the other bounds follow elementwise.
+    oos_starts = pd.date_range(start=start + train_off, end=end, freq=oos_off)
+    oos_ends = oos_starts + oos_off - one_sec
+    keep = oos_ends <= end
+    oos_starts = oos_starts[keep]
+    oos_ends = oos_ends[keep]
+    train_starts = oos_starts - train_off
+    train_ends = oos_starts - one_sec
+
+    # inclusive [start, end] bounds -> half-open row ranges, one binary search per column
+    return pd.DataFrame({
+        "train_start": train_starts,
+        "train_end": train_ends,
+        "oos_start": oos_starts,
+        "oos_end": oos_ends,
+        "train_lo": index_utc.searchsorted(train_starts, side="left"),
+        "train_hi": index_utc.searchsorted(train_ends, side="right"),
+        "oos_lo": index_utc.searchsorted(oos_starts, side="left"),
+        "oos_hi": index_utc.searchsorted(oos_ends, side="right"),
+    })
+
+
+def make_quarterly_wfa_windows(index_utc: pd.DatetimeIndex, train_months: int = 12, oos_months: int = 3) -> List[WfaWindow]:
+    """Create rolling walk-forward windows inside a given time span.
+
+    - Each step advances by oos_months.
+    - train window length fixed.
+    - train_lo/train_hi/oos_lo/oos_hi are the row bounds of each span in index_utc.
 
-    oos_start = start + pd.DateOffset(months=train_months)
-    while True:
-        train_start = oos_start - pd.DateOffset(months=train_months)
-        train_end = oos_start - pd.Timedelta(seconds=1)
-        oos_end = oos_start + pd.DateOffset(months=oos_months) - pd.Timedelta(seconds=1)
+    Index must be tz-aware UTC and sorted. See wfa_windows_frame for the same windows
+    as columns.
+    """
+    frame = wfa_windows_frame(index_utc, train_months=train_months, oos_months=oos_months)
+    return [WfaWindow(*row) for row in frame.itertuples(index=False)]
 
-        if oos_end > end:
-            break
+def slice_utc(df: pd.DataFrame, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Rows with start <= index <= end of a sorted index (binary search, no boolean mask)."""
+    idx = df.index
+    return df.iloc[idx.searchsorted(start, side="left"):idx.searchsorted(end, side="right")]
 
-        windows.append(
-            WfaWindow(
-                train_start=train_start,
-                train_end=train_end,
-                oos_start=oos_start,
-                oos_end=oos_end,
-            )
-        )
 
-        oos_start = oos_start + pd.DateOffset(months=oos_months)
+def run_wfa(
+    windows: List[WfaWindow],
+    runner: Callable[[int, WfaWindow, List[pd.DataFrame] | None, List[pd.DataFrame]], Any],
+    dfs_utc: List[pd.DataFrame],
+    max_workers: int | None = None,
+    with_train: bool = True,
+) -> List[Any]:
+    """Evaluate walk-forward windows independently, one process per worker.
+
+    runner(i, window, train_dfs, oos_dfs) gets each leg of dfs_utc cut to the window's
+    train and OOS spans (train_dfs is None when with_train is False). Only those slices
+    are sent to the worker, not the whole history, so runner must be picklable: a
+    module-level function or a functools.partial of one.
+
+    max_workers defaults to os.cpu_count(); 1 runs in-process. Results come back in
+    window order.
+    """
+    def _args(i: int, w: WfaWindow):
+        train = [slice_utc(df, w.train_start, w.train_end) for df in dfs_utc] if with_train else None
+        oos = [slice_utc(df, w.oos_start, w.oos_end) for df in dfs_utc]
+        return i, w, train, oos
+
+    n = len(windows)
+    workers = min(max_workers or os.cpu_count() or 1, max(n, 1))
+    if workers <= 1:
+        return [runner(*_args(i, w)) for i, w in enumerate(windows)]
 
-    return windows
+    results: List[Any] = [None] * n
+    with ProcessPoolExecutor(max_workers=workers) as ex:
+        futs = {ex.submit(runner, *_args(i, w)): i for i, w in enumerate(windows)}
+        for fut in as_completed(futs):
+            results[futs[fut]] = fut.result()
+    return results